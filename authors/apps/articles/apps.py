@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ArticlesConfig(AppConfig):
+    name = 'authors.apps.articles'
+
+    def ready(self):
+        # connect the signal receivers which keep derived data up to date
+        from . import cache, export, feed, search, tags, threads  # noqa
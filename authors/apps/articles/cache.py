@@ -0,0 +1,110 @@
+"""
+Cache of serialized articles for the article detail endpoint.
+
+Payloads are stored under the slug of the article and a version, which is
+the `changed_at` time of the article as read from the database. Anything
+that changes what an article looks like moves `changed_at` on, either by
+saving the article or through `invalidate_article`, so every process sees
+the new version as soon as the change commits, whatever the cache backend,
+and a stale payload is never read again, only left to expire. Fields which
+depend on the reader, such as `favourite`, are left out of the payload and
+worked out per request.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Article, ArticleTags
+
+# fields of the serialized article which depend on who is reading it
+PER_USER_FIELDS = ('favourite',)
+
+
+def _key(slug, version):
+    return 'article:{}:{}'.format(slug, version.isoformat())
+
+
+def _count(name):
+    """Add one to a hit or miss counter."""
+    key = 'article-cache:{}'.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_version(slug):
+    """
+    Return the current version of an article's payload, the time it was
+    last changed, or None if there is no such article.
+    """
+    return Article.objects.filter(slug=slug).values_list(
+        'changed_at', flat=True).first()
+
+
+def get_article(slug, version):
+    """
+    Return the cached payload of the given version of an article or None on
+    a miss.
+    """
+    data = cache.get(_key(slug, version))
+    _count('misses' if data is None else 'hits')
+    return data
+
+
+def set_article(article, data):
+    """
+    Cache the payload of an article without the per user fields, under the
+    version it was serialized from.
+    """
+    data = {
+        field: value for field, value in data.items()
+        if field not in PER_USER_FIELDS
+    }
+    cache.set(_key(article.slug, article.changed_at), data,
+              settings.ARTICLE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_article(*slugs):
+    """
+    Move the given articles on to a new version, for changes which do not
+    save the article itself.
+    """
+    if slugs:
+        Article.objects.filter(slug__in=slugs).update(
+            changed_at=timezone.now())
+
+
+def stats():
+    """Return the hit and miss counters of the cache."""
+    counters = cache.get_many(['article-cache:hits', 'article-cache:misses'])
+    return {
+        'hits': counters.get('article-cache:hits', 0),
+        'misses': counters.get('article-cache:misses', 0),
+    }
+
+
+def _invalidate_ids(ids):
+    Article.objects.filter(pk__in=ids).update(changed_at=timezone.now())
+
+
+@receiver(post_save, sender=ArticleTags)
+def invalidate_tagged_articles(sender, instance, **kwargs):
+    _invalidate_ids(instance.article_set.values('pk'))
+
+
+@receiver(m2m_changed, sender=Article.article_tags.through)
+def invalidate_related_articles(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_article(instance.slug)
+    elif action == 'pre_clear':
+        # the rows are gone after the clear so look the articles up first
+        _invalidate_ids(list(sender.objects.filter(
+            articletags=instance.pk).values_list('article', flat=True)))
+    elif action in ('post_add', 'post_remove'):
+        _invalidate_ids(pk_set)
@@ -0,0 +1,60 @@
+"""
+Streaming export of articles as newline delimited JSON.
+
+Deleted articles are recorded in `DeletedArticle`, so that an incremental
+export can follow the articles updated since a time with a line for each
+article deleted since then.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Article, DeletedArticle
+from .renderers import ArticleJSONRenderer
+from .serializers import ArticleSerializer
+
+
+def export_articles(queryset, chunk_size, context=None):
+    """
+    Yield the articles of the queryset as newline delimited JSON, one chunk
+    of `chunk_size` articles at a time. Chunks are fetched by primary key
+    rather than with `QuerySet.iterator()`, which ignores `prefetch_related`,
+    so each chunk costs a constant number of queries and only one chunk is
+    held in memory.
+    """
+    renderer = ArticleJSONRenderer()
+    queryset = queryset.order_by('pk')
+    last = 0
+    while True:
+        articles = list(queryset.filter(pk__gt=last)[:chunk_size])
+        if not articles:
+            return
+        rows = ArticleSerializer(
+            articles, many=True, context=context or {}).data
+        yield b''.join(renderer.dumps(row) + b'\n' for row in rows)
+        last = articles[-1].pk
+
+
+def export_deletions(since, chunk_size):
+    """
+    Yield a line of JSON holding the slug and deletion time of every
+    article deleted since the given time, one chunk at a time.
+    """
+    renderer = ArticleJSONRenderer()
+    deletions = DeletedArticle.objects.filter(
+        deleted_at__gte=since).order_by('pk')
+    last = 0
+    while True:
+        rows = list(deletions.filter(pk__gt=last).values_list(
+            'pk', 'slug', 'deleted_at')[:chunk_size])
+        if not rows:
+            return
+        yield b''.join(renderer.dumps({
+            'slug': slug, 'deleted': True,
+            'deleted_at': deleted_at.isoformat()}) + b'\n'
+            for _, slug, deleted_at in rows)
+        last = rows[-1][0]
+
+
+@receiver(post_delete, sender=Article)
+def record_deleted_article(sender, instance, **kwargs):
+    DeletedArticle.objects.create(slug=instance.slug)
@@ -0,0 +1,86 @@
+"""
+The following feed: the articles of the authors a user follows.
+
+Articles are pushed into the timelines of the followers of their author
+when they are created (fan out on write) by the `fan_out_article` task, so
+that a page of a feed is a range of the timeline index. Articles of authors
+with more than `FEED_FANOUT_THRESHOLD` followers are not pushed; they are
+merged into the feeds of the followers as they are read (fan out on read)
+instead, along with the articles still being pushed.
+
+Feeds are ordered by the creation of the articles, newest first, and paged
+through by the position of the last article of a page.
+
+Timelines also follow the follows: following an author pushes their
+latest articles into the timeline and unfollowing them takes their
+articles out.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from authors.apps.profiles.models import Profile
+from .models import Article, TimelineEntry
+from .tasks import fan_out_article
+
+
+def _before(position, pk_field):
+    created_at, pk = position
+    return Q(created_at__lt=created_at) | Q(
+        created_at=created_at, **{pk_field + '__lt': pk})
+
+
+def feed_page(user, size, position=None):
+    """
+    Return the positions, `(created_at, article id)`, of the `size` latest
+    articles in the feed of the user, older than `position` if given. The
+    page is merged from the user's timeline and the articles which are not
+    fanned out of the authors they follow, reading at most `size` rows of
+    each.
+    """
+    timeline = TimelineEntry.objects.filter(user=user)
+    pending = Article.objects.filter(
+        fanned_out=False,
+        author__in=user.profile.follows.values('user__username'))
+    if position is not None:
+        timeline = timeline.filter(_before(position, 'article'))
+        pending = pending.filter(_before(position, 'pk'))
+    pushed = timeline.order_by('-created_at', '-article_id').values_list(
+        'created_at', 'article')[:size]
+    pulled = pending.order_by('-created_at', '-pk').values_list(
+        'created_at', 'pk')[:size]
+    return sorted(set(pushed) | set(pulled), reverse=True)[:size]
+
+
+@receiver(post_save, sender=Article)
+def fan_out_created_article(sender, instance, created, **kwargs):
+    if created:
+        fan_out_article.delay(article_id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def follow_timeline(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse or action not in ('post_add', 'post_remove'):
+        # follows are only changed from the follower's side
+        return
+    followed = Profile.objects.filter(pk__in=pk_set)
+    if action == 'post_remove':
+        TimelineEntry.objects.filter(
+            user=instance.user_id,
+            article__author__in=followed.values('user__username')).delete()
+        return
+    # articles still being fanned out are pushed too, as the follower may
+    # be in a chunk which was already pushed; the fan out skips the entries
+    # pushed here, and the feed reads each article once, so those which
+    # are also merged into it as it is read show up once
+    latest = Article.objects.filter(
+        author__in=followed.values('user__username')).exclude(
+            pk__in=TimelineEntry.objects.filter(
+                user=instance.user_id).values('article')).order_by(
+                    '-created_at').values_list(
+                        'pk', 'created_at')[:settings.FEED_FANOUT_CHUNK_SIZE]
+    TimelineEntry.objects.bulk_create(
+        TimelineEntry(user_id=instance.user_id, article_id=pk,
+                      created_at=created_at)
+        for pk, created_at in latest)
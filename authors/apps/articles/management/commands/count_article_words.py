@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from authors.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    """
+    Fill in the stored word count and read time of existing articles.
+    """
+    help = 'Recompute the word count and read time of articles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of articles to update per query.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        total = 0
+        articles = Article.objects.only('pk', 'body').order_by('pk')
+        for article in articles.iterator(chunk_size=batch_size):
+            article.count_words()
+            batch.append(article)
+            if len(batch) == batch_size:
+                total += self.flush(batch)
+        total += self.flush(batch)
+        self.stdout.write(
+            self.style.SUCCESS('Counted words for {} articles.'.format(total)))
+
+    def flush(self, batch):
+        """Write the counted words of a batch of articles and empty it."""
+        with transaction.atomic():
+            for article in batch:
+                Article.objects.filter(pk=article.pk).update(
+                    word_count=article.word_count,
+                    read_time=article.read_time,
+                    changed_at=timezone.now())
+        count = len(batch)
+        batch.clear()
+        return count
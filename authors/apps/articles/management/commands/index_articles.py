@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.search import index_article
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full text search index of existing articles.
+    """
+    help = 'Add all articles to the search index.'
+
+    def handle(self, *args, **options):
+        total = 0
+        for article in Article.objects.order_by('pk').iterator():
+            index_article(article)
+            total += 1
+        self.stdout.write(
+            self.style.SUCCESS('Indexed {} articles.'.format(total)))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the denormalized favourites, likes, dislikes and rating
+    counters on articles from the records they summarize.
+    """
+    help = ('Recompute the favourites, likes, dislikes and rating counters '
+            'of articles.')
+
+    def handle(self, *args, **options):
+        updated = Article.objects.all().rebuild_counters()
+        self.stdout.write(
+            self.style.SUCCESS('Rebuilt counters for {} articles.'.format(
+                updated)))
@@ -0,0 +1,52 @@
+# Generated by Django 2.1 on 2026-10-18 09:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    """
+    Count the existing favourites, likes and dislikes of the articles into
+    their counters.
+    """
+    Article = apps.get_model('articles', 'Article')
+    Likes = apps.get_model('articles', 'Likes')
+
+    def counted(model, **filters):
+        rows = model.objects.filter(
+            article=OuterRef('pk'), **filters).order_by().values(
+                'article').annotate(total=Count('pk')).values('total')
+        return Coalesce(
+            Subquery(rows, output_field=models.IntegerField()), 0)
+
+    Article.objects.update(
+        favourites_count=counted(Article.favourited.through),
+        likes_count=counted(Likes, like=True),
+        dislikes_count=counted(Likes, like=False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_auto_20181024_1652'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='favourites_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.1 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_auto_20261018_1205'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='read_time',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.1 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_auto_20261018_1207'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['published_at', 'id'], name='articles_ar_publish_bb0f55_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 2.1 on 2026-10-18 09:22
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Index the search vector of articles, which only PostgreSQL supports.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX articles_article_search_vector_idx '
+            'ON articles_article USING gin (search_vector)')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS articles_article_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_auto_20261018_1218'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50)),
+                ('weight', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='articlesearchterm',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='articles.Article'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articlesearchterm',
+            unique_together={('term', 'article')},
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.1 on 2026-10-18 10:05
+
+import re
+
+from django.db import migrations, models
+
+
+def normalize_tags(apps, schema_editor):
+    """
+    Give every tag its normalized slug, see `models.normalize_tag`, merging
+    the tags which are spellings of the same slug into the oldest of them.
+    """
+    ArticleTags = apps.get_model('articles', 'ArticleTags')
+    Through = apps.get_model('articles', 'Article').article_tags.through
+    kept = {}
+    for tag in ArticleTags.objects.order_by('pk'):
+        slug = re.sub(r'[\s-]+', ' ', tag.tag.casefold()).strip()[:30].rstrip()
+        slug = slug or 'tag-{}'.format(tag.pk)
+        if slug not in kept:
+            tag.slug = slug
+            tag.save(update_fields=['slug'])
+            kept[slug] = tag
+            continue
+        # move the articles of the duplicate over to the kept tag, except
+        # those which already have it, whose links go with the duplicate
+        tagged = set(Through.objects.filter(
+            articletags=kept[slug]).values_list('article_id', flat=True))
+        Through.objects.filter(articletags=tag).exclude(
+            article_id__in=tagged).update(articletags=kept[slug])
+        tag.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_auto_20261018_1222'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articletags',
+            name='slug',
+            field=models.CharField(max_length=30, null=True),
+        ),
+        migrations.RunPython(normalize_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_articletags_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articletags',
+            name='slug',
+            field=models.CharField(max_length=30, unique=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.1 on 2026-10-18 10:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tagged_articles(apps, schema_editor):
+    """
+    Count the articles of the existing tags; trending scores are left to
+    the periodic rebuild.
+    """
+    ArticleTags = apps.get_model('articles', 'ArticleTags')
+    Through = apps.get_model('articles', 'Article').article_tags.through
+    rows = Through.objects.filter(articletags=OuterRef('pk')).order_by(
+    ).values('articletags').annotate(total=Count('pk')).values('total')
+    ArticleTags.objects.update(article_count=Coalesce(
+        Subquery(rows, output_field=models.IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_auto_20261018_1006'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articletags',
+            name='article_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articletags',
+            name='trending_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='articletags',
+            index=models.Index(fields=['-article_count'], name='articles_ar_article_7e4d5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articletags',
+            index=models.Index(fields=['-trending_score'], name='articles_ar_trendin_a23ec1_idx'),
+        ),
+        migrations.RunPython(count_tagged_articles, migrations.RunPython.noop),
+    ]
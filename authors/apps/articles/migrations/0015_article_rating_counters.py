@@ -0,0 +1,77 @@
+# Generated by Django 2.1 on 2026-10-18 10:13
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def count_ratings(apps, schema_editor):
+    """
+    Keep only the latest rating of each user for an article, then count
+    the ratings of the articles into their rating counters.
+    """
+    Article = apps.get_model('articles', 'Article')
+    ArticleRating = apps.get_model('articles', 'ArticleRating')
+    duplicated = ArticleRating.objects.values('article', 'user').annotate(
+        ratings=Count('pk'), latest=Max('pk')).filter(ratings__gt=1)
+    for pair in duplicated:
+        ArticleRating.objects.filter(
+            article=pair['article'], user=pair['user'],
+            pk__lt=pair['latest']).delete()
+
+    for totals in ArticleRating.objects.values('article').annotate(
+            total=Sum('rating'), ratings=Count('pk')):
+        stars = dict(ArticleRating.objects.filter(
+            article=totals['article']).values('rating').annotate(
+                ratings=Count('pk')).values_list('rating', 'ratings'))
+        Article.objects.filter(pk=totals['article']).update(
+            rating_sum=totals['total'],
+            rating_count=totals['ratings'],
+            rating_average=totals['total'] / totals['ratings'],
+            **{'rating_{}_count'.format(star): stars.get(star, 0)
+               for star in range(1, 6)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_auto_20261018_1308'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.1 on 2026-10-18 10:13
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0015_article_rating_counters'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='articlerating',
+            unique_together={('article', 'user')},
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.1 on 2026-10-18 10:19
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def thread_comments(apps, schema_editor):
+    """
+    Give the existing comments their paths, depths and reply counts.
+    Replies are made after the comments they answer, so their parents
+    have their paths by the time they are reached in order of id.
+    """
+    Comment = apps.get_model('articles', 'Comment')
+    replies = dict(Comment.objects.exclude(parent=None).values(
+        'parent').annotate(total=Count('pk')).values_list('parent', 'total'))
+    paths, depths = {}, {}
+    for comment in Comment.objects.order_by('pk').only('pk', 'parent'):
+        parent = comment.parent_id
+        paths[comment.pk] = '{}{:010d}/'.format(
+            paths.get(parent, ''), comment.pk)
+        depths[comment.pk] = depths[parent] + 1 if parent else 0
+        Comment.objects.filter(pk=comment.pk).update(
+            path=paths[comment.pk], depth=depths[comment.pk],
+            reply_count=replies.get(comment.pk, 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0016_articlerating_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=1100),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(thread_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.1 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0017_auto_20261018_1319'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'created_at'], name='articles_co_article_1d93b8_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.1 on 2026-10-18 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0018_auto_20261018_1322'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['user', '-created_at'], name='articles_bo_user_id_78d000_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 2.1 on 2026-10-18 10:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_timelines(apps, schema_editor):
+    """
+    Push the latest `FEED_FANOUT_CHUNK_SIZE` articles of the authors users
+    follow into their timelines, as following them would. The articles of
+    authors with more than `FEED_FANOUT_THRESHOLD` followers are left to be
+    merged into the feeds as they are read.
+    """
+    Article = apps.get_model('articles', 'Article')
+    TimelineEntry = apps.get_model('articles', 'TimelineEntry')
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = Profile.follows.through
+    authors = Profile.objects.annotate(
+        followers=models.Count('followed_by')).filter(
+            followers__gt=0).values_list(
+                'pk', 'user__username', 'followers')
+    popular = []
+    for profile_id, username, followers in authors.iterator():
+        if followers > settings.FEED_FANOUT_THRESHOLD:
+            popular.append(username)
+            continue
+        latest = list(Article.objects.filter(author=username).order_by(
+            '-created_at').values_list(
+                'pk', 'created_at')[:settings.FEED_FANOUT_CHUNK_SIZE])
+        if not latest:
+            continue
+        users = Follow.objects.filter(to_profile=profile_id).values_list(
+            'from_profile__user_id', flat=True)
+        TimelineEntry.objects.bulk_create(
+            (TimelineEntry(user_id=user_id, article_id=pk,
+                           created_at=created_at)
+             for user_id in users.iterator() for pk, created_at in latest),
+            batch_size=settings.FEED_FANOUT_CHUNK_SIZE)
+    Article.objects.exclude(author__in=popular).update(fanned_out=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0019_bookmark_created_at'),
+        ('profiles', '0002_profile_email_notification_enabled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='fanned_out',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['fanned_out', 'author', 'created_at'], name='articles_ar_fanned__9f7554_idx'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', '-created_at', '-article'], name='articles_ti_user_id_91b172_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('user', 'article')},
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
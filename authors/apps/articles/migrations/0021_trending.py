@@ -0,0 +1,33 @@
+# Generated by Django 2.1 on 2026-10-18 10:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0020_auto_20261018_1335'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='articles.Article')),
+                ('score', models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TrendingWatermark',
+            fields=[
+                ('source', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('last_id', models.PositiveIntegerField(default=0)),
+                ('scored_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['-score'], name='articles_tr_score_a217d3_idx'),
+        ),
+    ]
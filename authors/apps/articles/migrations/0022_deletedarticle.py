@@ -0,0 +1,21 @@
+# Generated by Django 2.1 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0021_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedArticle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(db_index=False, max_length=140)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
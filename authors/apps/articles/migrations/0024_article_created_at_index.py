@@ -0,0 +1,17 @@
+# Generated by Django 2.1 on 2026-10-18 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0022_deletedarticle'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['created_at'], name='articles_ar_created_b5cc75_idx'),
+        ),
+    ]
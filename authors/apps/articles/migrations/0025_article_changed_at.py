@@ -0,0 +1,28 @@
+# Generated by Django 2.1 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+def copy_updated_at(apps, schema_editor):
+    """
+    Start the articles off at the version they were cached under, the time
+    they were last updated.
+    """
+    Article = apps.get_model('articles', 'Article')
+    Article.objects.update(changed_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0024_article_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+    ]
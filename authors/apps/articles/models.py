@@ -1,7 +1,13 @@
 import uuid
 import re
-
-from django.db import models
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Count, Exists, ExpressionWrapper, F, OuterRef, Prefetch, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 from rest_framework.reverse import reverse as api_reverse
@@ -10,6 +16,84 @@ from authors.apps.authentication.models import User
 from authors import settings
 
 
+def _aggregate_related(model, aggregate, **filters):
+    """
+    Build a subquery aggregating the rows of `model` which belong to the
+    outer article so the total is computed in SQL alongside the article.
+    """
+    rows = model.objects.filter(article=OuterRef('pk'), **filters).order_by(
+    ).values('article').annotate(total=aggregate).values('total')
+    return Coalesce(
+        Subquery(rows, output_field=models.IntegerField()), 0)
+
+
+def _count_related(model, **filters):
+    return _aggregate_related(model, Count('pk'), **filters)
+
+
+def _rating_average(total, count):
+    """
+    Build the average rating out of expressions of the sum and the number
+    of ratings.
+    """
+    return ExpressionWrapper(
+        Cast(total, models.FloatField()) / count,
+        output_field=models.FloatField())
+
+
+class ArticleQuerySet(models.QuerySet):
+    """
+    Custom queryset with helpers for retrieving articles efficiently.
+    """
+
+    def rebuild_counters(self):
+        """
+        Recompute the denormalized favourites, likes, dislikes and rating
+        counters from the `Likes` and `ArticleRating` records and the
+        favourites table.
+        """
+        stars = {
+            'rating_{}_count'.format(star): _count_related(
+                ArticleRating, rating=star) for star in range(1, 6)
+        }
+        updated = self.update(
+            favourites_count=_count_related(Article.favourited.through),
+            likes_count=_count_related(Likes, like=True),
+            dislikes_count=_count_related(Likes, like=False),
+            rating_sum=_aggregate_related(ArticleRating, Sum('rating')),
+            rating_count=_count_related(ArticleRating),
+            changed_at=timezone.now(),
+            **stars)
+        self.filter(rating_count__gt=0).update(rating_average=_rating_average(
+            F('rating_sum'), F('rating_count')))
+        self.filter(rating_count=0).update(rating_average=None)
+        return updated
+
+    def with_favourite(self, user):
+        """
+        Annotate each article with whether the given user has favourited it.
+        """
+        if user is None or not user.is_authenticated:
+            return self
+        return self.annotate(is_favourite=Exists(
+            Article.favourited.through.objects.filter(
+                article=OuterRef('pk'), user=user.pk)))
+
+    def for_listing(self, user=None):
+        """
+        Return articles with everything the article serializer needs loaded
+        up front so that serializing a page costs a constant number of queries
+        regardless of how many articles it holds.
+        """
+        users = User.objects.only('pk')
+        return self.with_favourite(user).select_related(
+            'author').prefetch_related(
+                'article_tags',
+                Prefetch('favourited', queryset=users),
+                Prefetch('userLikes', queryset=users),
+                Prefetch('userDisLikes', queryset=users))
+
+
 class Article(models.Model):
     """
     Defines fields for each article.
@@ -18,6 +102,16 @@ class Article(models.Model):
     class Meta:
         # Order article by date published
         ordering = ['-published_at']
+        indexes = [
+            # the order articles are listed in by default
+            models.Index(fields=['published_at', 'id']),
+            # the order articles are paged through with cursors, see
+            # `ArticleCursorPagination`
+            models.Index(fields=['created_at']),
+            # the articles merged into feeds as they are read, see
+            # `feed.py`
+            models.Index(fields=['fanned_out', 'author', 'created_at']),
+        ]
 
     title = models.CharField(max_length=255)
     body = models.TextField()
@@ -26,6 +120,10 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(auto_now=True)
+    # when anything shown of the article last changed, its counters and
+    # tags as well as its content, which versions it in the cache, see
+    # `cache.py`
+    changed_at = models.DateTimeField(auto_now=True)
     slug = models.SlugField(unique=True, editable=False, max_length=140)
     favourited = models.ManyToManyField(
         User, related_name='favourited', blank=True)
@@ -41,6 +139,30 @@ class Article(models.Model):
         User, blank=True, related_name='Likes.user+')
     article_tags = models.ManyToManyField(
         'ArticleTags', blank=True)
+    # denormalized counters kept in step with the tables above so that
+    # reads never have to count rows
+    favourites_count = models.PositiveIntegerField(default=0)
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+    # whether the article has been pushed into the timelines of all the
+    # followers of its author, see `feed.py`
+    fanned_out = models.BooleanField(default=False)
+    # sum and number of the ratings of the article, and how many ratings
+    # gave it each number of stars, see `update_rating`
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    # computed from the body whenever it is saved
+    word_count = models.PositiveIntegerField(default=0)
+    read_time = models.PositiveIntegerField(default=1)
+    # weighted words of the article searched on PostgreSQL, see `search.py`
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
 
     def __str__(self):
         "Returns a string representation of article title."
@@ -48,13 +170,69 @@ class Article(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Generate a slug for the article before saving it.
+        Generate a slug for the article and count the words in its body
+        before saving it.
         """
         if not self.slug:
             self.slug = slugify(self.title + '-' +
                                 uuid.uuid4().hex[:6])
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # `changed_at` is not written unless listed, and it is what
+            # moves the article on in the cache
+            update_fields = kwargs['update_fields'] = set(update_fields) | {
+                'changed_at'}
+        if update_fields is None or 'body' in update_fields:
+            self.count_words()
+            if update_fields is not None:
+                update_fields |= {'word_count', 'read_time'}
         super().save(*args, **kwargs)
 
+    def update_counters(self, **deltas):
+        """
+        Atomically add the given deltas to the article's counters in the
+        database, e.g. `article.update_counters(likes_count=1)`.
+        """
+        Article.objects.filter(pk=self.pk).update(
+            changed_at=timezone.now(),
+            **{field: F(field) + delta for field, delta in deltas.items()})
+        self.refresh_from_db(fields=list(deltas) + ['changed_at'])
+
+    def update_rating(self, rating, previous=None):
+        """
+        Count a user's rating of the article, replacing the `previous`
+        rating they gave it if any, with a single UPDATE of the rating
+        counters and average.
+        """
+        deltas = defaultdict(int)
+        deltas['rating_sum'] += rating
+        deltas['rating_{}_count'.format(rating)] += 1
+        if previous is None:
+            deltas['rating_count'] += 1
+        else:
+            deltas['rating_sum'] -= previous
+            deltas['rating_{}_count'.format(previous)] -= 1
+        # the average is computed from the values being set, as UPDATE
+        # reads the columns before any of them change
+        average = _rating_average(
+            F('rating_sum') + deltas['rating_sum'],
+            F('rating_count') + deltas['rating_count'])
+        Article.objects.filter(pk=self.pk).update(
+            rating_average=average, changed_at=timezone.now(),
+            **{field: F(field) + delta for field, delta in deltas.items()})
+        self.refresh_from_db(
+            fields=list(deltas) + ['rating_average', 'changed_at'])
+
+    @property
+    def rating_histogram(self):
+        """
+        Return how many ratings gave the article each number of stars.
+        """
+        return {
+            str(star): getattr(self, 'rating_{}_count'.format(star))
+            for star in range(1, 6)
+        }
+
     def get_share_uri(self, request=None):
         """
         Method to prepare and generate urls  for sharing the article to facebook,
@@ -76,8 +254,11 @@ class Article(models.Model):
 
         return uri_data
 
-    @property
-    def get_time_to_read(self):
+    def count_words(self):
+        """
+        Count the words in the article body and work out how long it takes
+        to read them, storing both on the article.
+        """
         # Set the standard read time
         words_per_min = settings.WORDS_PER_MIN
         """
@@ -88,13 +269,14 @@ class Article(models.Model):
         # Using split to return a list of words from the post: split() returns a list of words delimited by sequences of whitespace e.g ['Cleaning', 'the', 'post', 'content' ]
         words_list = post.split()
         # Grabbing the length of the list returned by `split()` and converting toan `int` for division
-        words_in_article = int(len(words_list))
+        self.word_count = int(len(words_list))
         # Using double-slash to round down to nearest whole number
-        read_time = words_in_article // int(words_per_min)
-        # Return 1 min when the read time is less than 1
-        if read_time < 1:
-            return '1 min'
-        return str(read_time) + ' min'
+        # and reading for at least 1 min when the read time is less than 1
+        self.read_time = max(self.word_count // int(words_per_min), 1)
+
+    @property
+    def get_time_to_read(self):
+        return str(self.read_time) + ' min'
 
 
 class ArticleRating(models.Model):
@@ -104,6 +286,10 @@ class ArticleRating(models.Model):
     minimum value validator of 1 and a maximum value validator of 5
     """
 
+    class Meta:
+        # A user rates an article only once, rating it again changes it.
+        unique_together = (('article', 'user'))
+
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     rating = models.IntegerField(
@@ -130,12 +316,123 @@ class Likes(models.Model):
     like = models.BooleanField()
 
 
+# runs of whitespace and hyphens, which separate the words of a tag
+TAG_SEPARATORS = re.compile(r'[\s-]+')
+
+
+def normalize_tag(name):
+    """
+    Return the slug identifying a tag, which is the same for every spelling
+    of it such as "Machine Learning" and "machine-learning". Other symbols
+    are kept, so that "C++", "C#" and "C" are different tags.
+    """
+    return TAG_SEPARATORS.sub(' ', name.casefold()).strip()[:30].rstrip()
+
+
+class ArticleTagsQuerySet(models.QuerySet):
+    """
+    Custom queryset for resolving tag names to tags.
+    """
+
+    def resolve(self, names):
+        """
+        Return the tags with the given names, creating the missing ones.
+        Tags are matched by their normalized slug, with one query for the
+        existing tags and one insert for the missing ones however many
+        names there are.
+        """
+        names_by_slug = {}
+        for name in names:
+            name = name.strip()[:30]
+            slug = normalize_tag(name)
+            if slug:
+                names_by_slug.setdefault(slug, name)
+        tags = list(self.filter(slug__in=names_by_slug))
+        found = {tag.slug for tag in tags}
+        missing = [slug for slug in names_by_slug if slug not in found]
+        if not missing:
+            return tags
+        try:
+            with transaction.atomic():
+                self.bulk_create(
+                    ArticleTags(slug=slug, tag=names_by_slug[slug])
+                    for slug in missing)
+        except IntegrityError:
+            # another request created some of the tags first
+            for slug in missing:
+                self.get_or_create(
+                    slug=slug, defaults={'tag': names_by_slug[slug]})
+        # bulk_create only sets primary keys on PostgreSQL
+        return list(self.filter(slug__in=names_by_slug))
+
+    def rebuild_counts(self):
+        """
+        Recompute the number of articles with each tag and its trending
+        score. An article counts towards the score once for each of the
+        last day, week and month it was created in, so recent articles
+        weigh the most.
+        """
+        def tagged(**filters):
+            rows = Article.article_tags.through.objects.filter(
+                articletags=OuterRef('pk'), **filters).order_by().values(
+                    'articletags').annotate(total=Count('pk')).values('total')
+            return Coalesce(
+                Subquery(rows, output_field=models.IntegerField()), 0)
+
+        now = timezone.now()
+        return self.update(
+            article_count=tagged(),
+            trending_score=sum(
+                tagged(article__created_at__gte=now - timezone.timedelta(
+                    days=days)) for days in (1, 7, 30)))
+
+
 class ArticleTags(models.Model):
+
+    class Meta:
+        # Tags are listed by popularity or by trend
+        indexes = [
+            models.Index(fields=['-article_count']),
+            models.Index(fields=['-trending_score']),
+        ]
+
     tag = models.CharField(max_length=30, unique=True)
+    # the normalized tag which tags are looked up by, see `normalize_tag`
+    slug = models.CharField(max_length=30, unique=True)
+    # materialized from the articles with the tag, see `rebuild_counts`
+    article_count = models.PositiveIntegerField(default=0)
+    trending_score = models.PositiveIntegerField(default=0)
+
+    objects = ArticleTagsQuerySet.as_manager()
 
     def __str__(self):
         return self.tag
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = normalize_tag(self.tag)
+        super().save(*args, **kwargs)
+
+
+class ArticleSearchTerm(models.Model):
+    """
+    Inverted index of the words in articles used for searching databases
+    other than PostgreSQL, see `search.py`.
+    """
+
+    class Meta:
+        # Each word is stored once per article and looked up by word.
+        unique_together = (('term', 'article'))
+
+    term = models.CharField(max_length=50)
+    article = models.ForeignKey(
+        Article, related_name='search_terms', on_delete=models.CASCADE)
+    # how much the word counts towards the rank of the article
+    weight = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return self.term
+
 
 class ArticleReport(models.Model):
     """
@@ -158,16 +455,47 @@ class Comment(models.Model):
     on an article
     """
 
+    class Meta:
+        indexes = [
+            # comments of an article in the order they are paged through
+            models.Index(fields=['article', 'created_at']),
+        ]
+
     commented_by = models.ForeignKey(
         User, to_field='username', on_delete=models.CASCADE)
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     comment_body = models.CharField(max_length=500)
     created_at = models.DateTimeField(auto_now_add=True)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True)
+    # the zero padded ids of the ancestors of the comment followed by its
+    # own, e.g. `0000000001/0000000007/`, so that a thread is found by the
+    # path of its first comment as a prefix and is listed depth first when
+    # ordered by path
+    path = models.CharField(
+        max_length=1100, db_index=True, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # the number of direct replies to the comment, see `threads.py`
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.commented_by.username
 
+    def save(self, *args, **kwargs):
+        if self.path:
+            return super().save(*args, **kwargs)
+        # the path ends with the id, known once the comment is inserted
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            parent = self.parent
+            self.path = '{}{:010d}/'.format(
+                parent.path if parent else '', self.pk)
+            self.depth = parent.depth + 1 if parent else 0
+            Comment.objects.filter(pk=self.pk).update(
+                path=self.path, depth=self.depth)
+            if parent:
+                Comment.objects.filter(pk=parent.pk).update(
+                    reply_count=F('reply_count') + 1)
+
 
 class Bookmark(models.Model):
     """
@@ -179,10 +507,75 @@ class Bookmark(models.Model):
         # Making an article_id and user_id unique_together achieves
         # the intended behavior.
         unique_together = (('article', 'user'))
+        indexes = [
+            # the reading list of a user, latest bookmarks first
+            models.Index(fields=['user', '-created_at']),
+        ]
     article = models.ForeignKey(
         Article, on_delete=models.CASCADE)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.article.slug
+
+
+class TimelineEntry(models.Model):
+    """
+    An article in the following feed of a user, pushed there when an author
+    the user follows publishes it. See `feed.py`.
+    """
+    class Meta:
+        # An article appears in a feed only once.
+        unique_together = (('user', 'article'))
+        indexes = [
+            # the feed of a user, latest articles first
+            models.Index(fields=['user', '-created_at', '-article']),
+        ]
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='timeline')
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name='+')
+    # when the article was created, copied so that a page of the feed is
+    # read from the index without the articles
+    created_at = models.DateTimeField()
+
+
+class TrendingScore(models.Model):
+    """
+    The engagement of an article, each like, favourite, rating, comment and
+    bookmark counting less the older it is. Kept by `trending.py`, which
+    drops articles whose engagement has faded.
+    """
+    class Meta:
+        indexes = [
+            # articles are ranked most trending first
+            models.Index(fields=['-score']),
+        ]
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True,
+        related_name='trending')
+    score = models.FloatField()
+
+
+class TrendingWatermark(models.Model):
+    """
+    How far `trending.py` has counted the engagement of a kind, so that
+    every run only reads what happened since the last one.
+    """
+    # the kind of engagement, e.g. "likes"
+    source = models.CharField(max_length=30, primary_key=True)
+    # the id of the last row counted
+    last_id = models.PositiveIntegerField(default=0)
+    # when the scores were last brought up to date
+    scored_at = models.DateTimeField()
+
+
+class DeletedArticle(models.Model):
+    """
+    A deleted article, recorded by `export.py` so that incremental exports
+    can tell consumers which articles to drop.
+    """
+    slug = models.SlugField(max_length=140, db_index=False)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -0,0 +1,142 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, CursorPagination, PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ArticleCursorPagination(CursorPagination):
+    """
+    Cursor pagination for article feeds, newest articles first.
+    Pages are fetched with an indexed `WHERE created_at < ...` lookup from
+    the creation time of the last article of the previous page, with an
+    `OFFSET` only past the articles created at that same time, and no total
+    count is computed, so every page costs the same no matter how deep into
+    the feed it is. Creation times never change, unlike `published_at`
+    which moves with every edit. Pass `?page_size=` for up to 100 articles
+    a page.
+    """
+    ordering = ('-created_at',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class FeedPagination(BasePagination):
+    """
+    Keyset pagination for the following feed, whose pages are merged from
+    several sources by `feed.feed_page` rather than sliced off a queryset.
+    The `next` link holds the position, creation time and id, of the last
+    article of the page; there is no `previous` link. Pass `?page_size=`
+    for up to 100 articles a page.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_position(self, request):
+        """
+        Return the position the page starts after, None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, pk = urlsafe_b64decode(
+                encoded.encode('ascii')).decode('ascii').split('|')
+            position = (parse_datetime(created_at), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def paginate_positions(self, positions, request):
+        """
+        Keep the positions of the articles of the page to link to the next
+        one, and return the ids of the articles in order.
+        """
+        self.request = request
+        size = self.get_page_size(request)
+        self.next_position = positions[-1] if len(positions) == size else None
+        return [pk for created_at, pk in positions]
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        created_at, pk = self.next_position
+        encoded = urlsafe_b64encode('{}|{}'.format(
+            created_at.isoformat(), pk).encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(),
+                                   self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+
+class BookmarkCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the reading list of a user, latest bookmarks
+    first. Pass `?page_size=` for up to 100 bookmarks a page.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CommentCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the comments of an article or replies to a
+    comment, oldest first, so that long discussions page at the same cost
+    all the way through. Pass `?page_size=` for up to 100 comments a page.
+    """
+    ordering = ('created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class TagPagination(PageNumberPagination):
+    """
+    Page number pagination for tags, letting a tag cloud ask for as many
+    tags as it shows with `?page_size=`.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CommentThreadPagination(PageNumberPagination):
+    """
+    Page number pagination for the comments opening threads, with
+    `?page_size=` for up to 100 threads a page.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class TrendingPagination(PageNumberPagination):
+    """
+    Page number pagination for the trending articles, whose ids are paged
+    through as cached by `trending.py`. Pass `?page_size=` for up to 100
+    articles a page.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
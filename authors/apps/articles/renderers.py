@@ -1,50 +1,30 @@
-import json
+from authors.apps.core.renderers import EnvelopeJSONRenderer
 
-from rest_framework.renderers import JSONRenderer
-from rest_framework.utils.serializer_helpers import ReturnDict
 
-
-class ArticleJSONRenderer(JSONRenderer):
+class ArticleJSONRenderer(EnvelopeJSONRenderer):
     """JSONRenderClass for formatting Article model data into JSON."""
 
-    charset = 'utf-8'
+    envelope = 'Article'
+    list_envelope = 'Articles'
+    envelope_errors = True
 
-    def render(self, data, media_type=None, renderer_context=None):
-        """Return data in json format."""
 
-        if type(data) == ReturnDict:
-            # single article
-            return json.dumps({
-                'Article': data
-            })
-        else:
-            # many articles
-            return json.dumps({
-                'Articles': data
-            })
+class BookmarkJSONRenderer(EnvelopeJSONRenderer):
+    """JSONRenderClass for formatting Article model data into JSON."""
 
+    envelope = 'Bookmark'
+    list_envelope = 'Bookmarks'
 
-class BookmarkJSONRenderer(JSONRenderer):
-    """JSONRenderClass for formatting Article model data into JSON."""
+    def render_errors(self, data, accepted_media_type=None,
+                      renderer_context=None):
+        """
+        Render only the errors of a failed request.
+        """
+        return self.dumps(data['errors'], accepted_media_type,
+                          renderer_context)
+
+
+class TagJSONRenderer(EnvelopeJSONRenderer):
+    """JSONRenderClass for formatting tags into JSON."""
 
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        """Return data in json format."""
-        error = data.get("errors", None)
-        if error:
-            """
-            Let the default JSONRenderer handle rendering errors.
-            """
-            return super(BookmarkJSONRenderer, self).render(error)
-
-        if type(data) == ReturnDict:
-            # single bookmark
-            return json.dumps({
-                'Bookmark': data
-            })
-        else:
-            # many bookmarks
-            return json.dumps({
-                'Bookmarks': data
-            })
+    envelope = 'tags'
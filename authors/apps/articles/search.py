@@ -0,0 +1,144 @@
+"""
+Full text search over articles.
+
+On PostgreSQL articles are matched against a weighted `tsvector` column
+which is kept up to date whenever an article or its tags are saved. Other
+databases fall back to an inverted index of the words in every article
+stored in `ArticleSearchTerm`. Both rank results by where the words were
+found: the title weighs most, then the tags and description, then the body.
+"""
+import html
+import re
+from collections import Counter
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector)
+from django.db import connection, transaction
+from django.db.models import (
+    Count, F, IntegerField, OuterRef, Subquery, Sum, TextField, Value)
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import Article, ArticleSearchTerm
+
+# the text search configuration used for PostgreSQL
+CONFIG = 'english'
+# characters of the body shown around the first match of a query
+SNIPPET_LENGTH = 200
+
+
+def tokenize(text):
+    """
+    Split text into the lower cased words that are indexed.
+    """
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def index_article(article):
+    """
+    Update the search index with the current content of an article.
+    """
+    tags = ' '.join(article.article_tags.values_list('tag', flat=True))
+    fields = (
+        (article.title, 'A', 4),
+        (tags, 'B', 3),
+        (article.description, 'B', 2),
+        (article.body, 'C', 1),
+    )
+    if is_postgres():
+        vector = None
+        for text, weight, _ in fields:
+            part = SearchVector(
+                Value(text, output_field=TextField()),
+                weight=weight, config=CONFIG)
+            vector = part if vector is None else vector + part
+        Article.objects.filter(pk=article.pk).update(search_vector=vector)
+        return
+
+    max_length = ArticleSearchTerm._meta.get_field('term').max_length
+    weights = Counter()
+    for text, _, weight in fields:
+        for word in tokenize(text):
+            weights[word[:max_length]] += weight
+    with transaction.atomic():
+        ArticleSearchTerm.objects.filter(article=article).delete()
+        ArticleSearchTerm.objects.bulk_create([
+            ArticleSearchTerm(article=article, term=term, weight=weight)
+            for term, weight in weights.items()
+        ])
+
+
+def search_articles(queryset, query):
+    """
+    Filter articles down to the ones matching every word of the query and
+    order them by rank, best match first.
+    """
+    words = set(tokenize(query))
+    if not words:
+        return queryset.none()
+    if is_postgres():
+        search_query = SearchQuery(query, config=CONFIG)
+        return queryset.filter(search_vector=search_query).annotate(
+            rank=SearchRank(F('search_vector'), search_query)).order_by(
+                '-rank', '-published_at')
+
+    # articles containing every word, found through the index on `term`
+    found = ArticleSearchTerm.objects.filter(term__in=words).order_by(
+    ).values('article').annotate(matched=Count('pk')).filter(
+        matched=len(words)).values('article')
+    rank = ArticleSearchTerm.objects.filter(
+        article=OuterRef('pk'), term__in=words).order_by().values(
+            'article').annotate(total=Sum('weight')).values('total')
+    return queryset.filter(pk__in=found).annotate(
+        rank=Subquery(rank, output_field=IntegerField())).order_by(
+            '-rank', '-published_at')
+
+
+def highlight(text, query, length=None):
+    """
+    Wrap the words of the query found in text in `<em>` tags. When a length
+    is given only a snippet of about that length around the first match is
+    returned. The text is HTML escaped, so that the `<em>` tags are the only
+    markup in it.
+    """
+    words = set(tokenize(query))
+    text = text or ''
+    if not words:
+        return html.escape(text)
+    pattern = re.compile(
+        r'\b({})\b'.format('|'.join(map(re.escape, words))), re.IGNORECASE)
+    if length is not None and len(text) > length:
+        match = pattern.search(text)
+        start = max((match.start() if match else 0) - length // 2, 0)
+        end = start + length
+        text = '{}{}{}'.format(
+            '...' if start else '', text[start:end],
+            '...' if end < len(text) else '')
+    # the matches are at the odd indexes of the split text
+    return ''.join(
+        '<em>{}</em>'.format(html.escape(part)) if index % 2
+        else html.escape(part)
+        for index, part in enumerate(pattern.split(text)))
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-index an article when its text is saved.
+    """
+    searchable = {'title', 'description', 'body'}
+    if update_fields is None or searchable & set(update_fields):
+        index_article(instance)
+
+
+@receiver(m2m_changed, sender=Article.article_tags.through)
+def index_tagged_article(sender, instance, action, reverse, **kwargs):
+    """
+    Re-index an article when its tags change.
+    """
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        index_article(instance)
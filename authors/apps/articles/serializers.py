@@ -1,8 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 
 from .models import (Article, ArticleRating, Likes,
                      ArticleTags, Comment, ArticleReport, Bookmark)
+from .search import SNIPPET_LENGTH, highlight
 
 from ..authentication.models import User
 from ..authentication.serializers import UserSerializer
@@ -12,8 +14,11 @@ from ..profiles.serializers import ProfileSerializer
 class ArticleSerializer(serializers.ModelSerializer):
     """Serializer for articles."""
     favourite = serializers.SerializerMethodField(method_name='get_favorite')
-    favouritesCount = serializers.SerializerMethodField(
-        method_name='get_favorites_count')
+    favouritesCount = serializers.ReadOnlyField(source='favourites_count')
+    likesCount = serializers.ReadOnlyField(source='likes_count')
+    dislikesCount = serializers.ReadOnlyField(source='dislikes_count')
+    ratingsCount = serializers.ReadOnlyField(source='rating_count')
+    rating_histogram = serializers.ReadOnlyField()
     share_urls = serializers.SerializerMethodField(read_only=True)
     time_to_read = serializers.ReadOnlyField(source="get_time_to_read")
     article_tags = serializers.StringRelatedField(many=True, read_only=True)
@@ -37,7 +42,12 @@ class ArticleSerializer(serializers.ModelSerializer):
             "favouritesCount",
             "userLikes",
             "userDisLikes",
+            "likesCount",
+            "dislikesCount",
             "rating_average",
+            "ratingsCount",
+            "rating_histogram",
+            "word_count",
             "time_to_read",
             "article_tags",
             "report_count",
@@ -49,12 +59,11 @@ class ArticleSerializer(serializers.ModelSerializer):
         request = self.context.get('request', None)
         if request is None or not request.user.is_authenticated:
             return False
+        # use the annotation from `Article.objects.for_listing` if present
+        if hasattr(instance, 'is_favourite'):
+            return instance.is_favourite
         return instance.favourited.filter(pk=request.user.pk).exists()
 
-    def get_favorites_count(self, instance):
-        """Return the number of users who have favourited the atricle."""
-        return instance.favourited.count()
-
     def get_share_urls(self, instance):
         """
         Populates the share_urls field with the urls for facebook, twitter
@@ -64,6 +73,26 @@ class ArticleSerializer(serializers.ModelSerializer):
         return instance.get_share_uri(request=request)
 
 
+class ArticleSearchSerializer(ArticleSerializer):
+    """Serializer for articles found by a search."""
+    highlight = serializers.SerializerMethodField()
+
+    class Meta(ArticleSerializer.Meta):
+        fields = ArticleSerializer.Meta.fields + ('highlight',)
+
+    def get_highlight(self, instance):
+        """
+        Return the title, description and a snippet of the body with the
+        words of the search query highlighted.
+        """
+        query = self.context.get('search_query') or ''
+        return {
+            'title': highlight(instance.title, query),
+            'description': highlight(instance.description, query),
+            'body': highlight(instance.body, query, SNIPPET_LENGTH),
+        }
+
+
 class ArticleRatingSerializer(serializers.ModelSerializer):
     class Meta:
         model = ArticleRating
@@ -72,6 +101,8 @@ class ArticleRatingSerializer(serializers.ModelSerializer):
         Declare all fields we need to be returned from ArticleRating model
         """
         fields = '__all__'
+        # rating an article again updates the rating, see `create`
+        validators = []
 
     def __init__(self, *args, **kwargs):
         super(ArticleRatingSerializer, self).__init__(*args, **kwargs)
@@ -98,15 +129,22 @@ class ArticleRatingSerializer(serializers.ModelSerializer):
         Method for creating an ArticleRating object
         It checks if a user has made a rating for an article. If yes it calls
         the update method. If not, it creates a new ArticleRating object.
+        The rating counters of the article are updated to match either way.
         """
-        article_rating_object, created = ArticleRating.objects.get_or_create(
-            article_id=validated_data.get('article').id,
-            user_id=validated_data.get('user').id,
-            defaults={'rating': validated_data.get('rating', None)}, )
-
-        if not created:
-            self.update(instance=article_rating_object,
-                        validated_data=validated_data)
+        article = validated_data.get('article')
+        with transaction.atomic():
+            article_rating_object, created = (
+                ArticleRating.objects.select_for_update().get_or_create(
+                    article_id=article.id,
+                    user_id=validated_data.get('user').id,
+                    defaults={'rating': validated_data.get('rating', None)}))
+
+            previous = None
+            if not created:
+                previous = article_rating_object.rating
+                self.update(instance=article_rating_object,
+                            validated_data=validated_data)
+            article.update_rating(article_rating_object.rating, previous)
 
         return article_rating_object
 
@@ -128,7 +166,7 @@ class TagsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ArticleTags
-        fields = ('tag',)
+        fields = ('tag', 'slug', 'article_count', 'trending_score')
 
 
 class ArticleReportSerializer(serializers.ModelSerializer):
@@ -167,6 +205,18 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['commented_by', 'created_at', 'comment_body', 'id', 'parent']
 
 
+class CommentThreadSerializer(CommentSerializer):
+    """
+    Serializer for the comments of a thread, which are nested under the
+    comments they reply to by the view.
+    """
+    # comments refer to users by username, no need to load the users
+    commented_by = serializers.ReadOnlyField(source='commented_by_id')
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['depth', 'reply_count']
+
+
 class ArticleListingField(serializers.RelatedField):
     def to_representation(self, value):
         return (value.slug)
@@ -191,3 +241,22 @@ class BookmarkSerializer(serializers.ModelSerializer):
                 message='Sorry, you have already bookmarked this article'
             )
         ]
+
+
+class ArticleSummarySerializer(serializers.ModelSerializer):
+    """Serializer for the summary of an article in a list of articles."""
+    time_to_read = serializers.ReadOnlyField(source='get_time_to_read')
+
+    class Meta:
+        model = Article
+        fields = ('slug', 'title', 'description', 'author', 'image',
+                  'published_at', 'read_time', 'time_to_read')
+
+
+class BookmarkListSerializer(serializers.ModelSerializer):
+    """Serializer for the bookmarks of a reading list."""
+    article = ArticleSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Bookmark
+        fields = ('id', 'created_at', 'article')
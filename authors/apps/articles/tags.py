@@ -0,0 +1,67 @@
+"""
+Keep the materialized article counts of tags current.
+
+Whenever articles and tags are linked or unlinked, the counts of the tags
+involved are moved by the number of links made or removed. All tags are
+recounted periodically by `TagCountsCron`, which corrects any drift and
+lets trending scores decay.
+"""
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import Article, ArticleTags
+
+
+def _linked_ids(instance, reverse, pk_set=None):
+    """
+    Return the ids linked to `instance`, the tags of an article or the
+    articles of a tag when `reverse`, out of `pk_set` if given. The links
+    are locked until they are deleted so that a concurrent removal does not
+    uncount them again.
+    """
+    side, other = (
+        ('articletags', 'article') if reverse
+        else ('article', 'articletags'))
+    links = Article.article_tags.through.objects.select_for_update().filter(
+        **{side: instance.pk})
+    if pk_set is not None:
+        links = links.filter(**{other + '__in': pk_set})
+    return sorted(links.values_list(other + '_id', flat=True))
+
+
+def _move_tag_counts(instance, reverse, pk_set, delta):
+    if not pk_set:
+        return
+    if reverse:
+        tags, change = [instance.pk], delta * len(pk_set)
+    else:
+        tags, change = pk_set, delta
+    ArticleTags.objects.filter(pk__in=tags).update(
+        article_count=F('article_count') + change)
+
+
+@receiver(m2m_changed, sender=Article.article_tags.through)
+def count_tagged_articles(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    if action in ('pre_clear', 'pre_remove'):
+        # only the links which exist are uncounted, noted before they go
+        instance._unlinked_ids = _linked_ids(
+            instance, reverse, pk_set if action == 'pre_remove' else None)
+    elif action in ('post_clear', 'post_remove'):
+        _move_tag_counts(instance, reverse, instance._unlinked_ids, -1)
+    elif action == 'post_add':
+        # only the links which did not exist yet are in `pk_set`
+        _move_tag_counts(instance, reverse, pk_set, 1)
+
+
+@receiver(pre_delete, sender=Article)
+def note_deleted_article_tags(sender, instance, **kwargs):
+    # deleting an article removes its links without an m2m_changed signal
+    instance._deleted_tag_ids = _linked_ids(instance, reverse=False)
+
+
+@receiver(post_delete, sender=Article)
+def count_deleted_article_tags(sender, instance, **kwargs):
+    _move_tag_counts(
+        instance, False, getattr(instance, '_deleted_tag_ids', ()), -1)
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import transaction
+
+from authors.apps.core.tasks import task
+
+from .models import Article, TimelineEntry
+
+
+@task
+def fan_out_article(article_id, after=0):
+    """
+    Push an article into the timelines of its author's followers, one chunk
+    of `FEED_FANOUT_CHUNK_SIZE` followers per job, the next chunk being
+    queued as a job of its own so that a failure only retries a chunk. The
+    article is marked as fanned out once every chunk is pushed. Articles of
+    authors with more than `FEED_FANOUT_THRESHOLD` followers are never
+    fanned out but read from the follows instead, see `feed.py`.
+    :params int after: the user id of the last follower already handled
+    """
+    article = Article.objects.select_related('author__profile').filter(
+        pk=article_id).first()
+    if article is None:
+        # the article was deleted before it could be fanned out
+        return
+    profile = article.author.profile
+    if not after and profile.followers_count > settings.FEED_FANOUT_THRESHOLD:
+        return
+    followers = profile.followed_by.all()
+    chunk = list(followers.filter(user_id__gt=after).order_by(
+        'user_id').values_list(
+            'user_id', flat=True)[:settings.FEED_FANOUT_CHUNK_SIZE])
+    # followers who followed since the article was created may have it
+    # already, see `feed.follow_timeline`
+    pushed = set(TimelineEntry.objects.filter(
+        article=article, user_id__in=chunk).values_list('user_id', flat=True))
+    with transaction.atomic():
+        # the next chunk is queued along with the entries of this one
+        TimelineEntry.objects.bulk_create(
+            TimelineEntry(user_id=user_id, article=article,
+                          created_at=article.created_at)
+            for user_id in chunk if user_id not in pushed)
+        if len(chunk) == settings.FEED_FANOUT_CHUNK_SIZE:
+            fan_out_article.delay(article_id=article_id, after=chunk[-1])
+        else:
+            Article.objects.filter(pk=article_id).update(fanned_out=True)
@@ -1,4 +1,6 @@
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from .base_setup import Base
 from authors.apps.authentication.backends import generate_jwt_token
@@ -178,3 +180,41 @@ class ArticleBookmarkTests(Base):
                                       **headers
                                       )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reading_list_embeds_articles_in_constant_queries(self):
+        """
+        Tests that bookmarks are listed latest first with a summary of their
+        articles, with the same number of queries for any number of them
+        """
+        url = reverse('articles:user_bookmarks')
+        self.client.post(self.article_bookmark_url, **self.headers)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url, **self.headers)
+        for index in range(5):
+            response = self.client.post(
+                self.article_url,
+                dict(self.article_data, title='Article {}'.format(index)),
+                format="json", **self.headers)
+            self.client.post(reverse(
+                'articles:bookmark_article',
+                kwargs={'slug': response.data['slug']}), **self.headers)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url, **self.headers)
+        self.assertEqual(len(few), len(many))
+        bookmarks = response.data['results']
+        self.assertEqual(len(bookmarks), 6)
+        self.assertEqual(bookmarks[0]['article']['title'], 'Article 4')
+        self.assertEqual(bookmarks[0]['article']['author'],
+                         self.user_data['username'])
+        self.assertEqual(bookmarks[0]['article']['time_to_read'], '1 min')
+
+    def test_retrieve_a_single_bookmark_with_its_article(self):
+        """
+        Tests that a bookmark is retrieved with a summary of its article
+        """
+        response = self.client.post(self.article_bookmark_url,
+                                    **self.headers)
+        response = self.client.get(reverse(
+            'articles:user_bookmarks', kwargs={'pk': response.data['id']}),
+            **self.headers)
+        self.assertEqual(response.data['article']['slug'], self.article_slug)
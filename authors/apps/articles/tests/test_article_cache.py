@@ -0,0 +1,129 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from .base_setup import Base
+from authors.apps.articles.models import Article, Likes
+from authors.apps.authentication.models import User
+
+
+class ArticleCacheTests(Base):
+    """Test suite for caching serialized articles."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        response = self.client.post(self.article_url, self.article_data,
+                                    format="json", **self.headers)
+        self.slug = response.data['slug']
+        self.url = reverse('articles:retrieveUpdateDelete',
+                           kwargs={'slug': self.slug})
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_article_is_served_from_cache(self):
+        """
+        Tests that an article is serialized once and then read from the cache.
+        """
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data['title'], self.article_data['title'])
+        self.assertIn('"Article"', second.content.decode())
+
+    def test_cache_is_invalidated_by_changes(self):
+        """
+        Tests that liking or updating an article invalidates its cache, and
+        that only updating it changes when it was last edited.
+        """
+        edited = self.client.get(self.url).data['updated_at']
+        self.client.post(
+            reverse('articles:likeArticles', kwargs={'slug': self.slug}),
+            {'like': True}, format="json", **self.headers)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['likesCount'], 1)
+        self.assertEqual(response.data['updated_at'], edited)
+        self.client.put(self.url, dict(self.article_data, title='A new title'),
+                        format="json", **self.headers)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'A new title')
+        self.assertNotEqual(response.data['updated_at'], edited)
+
+    def test_cache_is_invalidated_by_updates_elsewhere(self):
+        """
+        Tests that changes made straight to the database, as another process
+        or a management command would, are not hidden by the cache.
+        """
+        self.client.get(self.url)
+        article = Article.objects.get(slug=self.slug)
+        Likes.objects.create(
+            article=article, user=User.objects.get(username='admin'),
+            like=True)
+        Article.objects.filter(pk=article.pk).rebuild_counters()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['likesCount'], 1)
+        Article.objects.get(pk=article.pk).update_counters(likes_count=1)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['likesCount'], 2)
+
+    def test_favourite_is_worked_out_per_reader(self):
+        """
+        Tests that a cached article still shows whether the reader has
+        favourited it.
+        """
+        self.client.post(
+            reverse('articles:favourite_article', kwargs={'slug': self.slug}),
+            format="json", **self.headers)
+        self.client.get(self.url, **self.headers)
+        mine = self.client.get(self.url, **self.headers)
+        anonymous = self.client.get(self.url)
+        self.assertEqual(mine['X-Cache'], 'HIT')
+        self.assertTrue(mine.data['favourite'])
+        self.assertFalse(anonymous.data['favourite'])
+        self.assertEqual(anonymous.data['favouritesCount'], 1)
+
+    def test_unchanged_article_is_not_sent_again(self):
+        """
+        Tests that polling an unchanged article with its ETag returns an
+        empty 304 response after a single query, and that a change to the
+        article changes its ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(queries), 1)
+        # readers see different `favourite` values so get different ETags
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.post(
+            reverse('articles:likeArticles', kwargs={'slug': self.slug}),
+            {'like': True}, format="json", **self.headers)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likesCount'], 1)
+
+    def test_cache_stats(self):
+        """
+        Tests that admins can see how often the cache was hit and missed.
+        """
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stats_url = reverse('articles:cache_stats')
+        response = self.client.get(stats_url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        admin = User.objects.get(username='admin')
+        admin.is_staff = True
+        admin.save()
+        response = self.client.get(stats_url, **self.headers)
+        self.assertEqual(response.data, {'hits': 1, 'misses': 1})
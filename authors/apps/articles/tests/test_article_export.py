@@ -0,0 +1,91 @@
+import gzip
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from .base_setup import Base
+from ..models import Article
+
+
+class ArticleExportTests(Base):
+    """Test suite for the streaming export of articles."""
+
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            self.client.post(
+                self.article_url,
+                dict(self.article_data, title='Article {}'.format(index)),
+                format="json", **self.headers)
+        self.export_url = reverse('articles:export')
+
+    def tearDown(self):
+        super().tearDown()
+
+    def export(self, **kwargs):
+        response = self.client.get(self.export_url, **kwargs)
+        content = b''.join(response.streaming_content)
+        return response, content
+
+    @override_settings(ARTICLE_EXPORT_CHUNK_SIZE=2)
+    def test_export_streams_every_article_in_chunks(self):
+        """
+        Tests that every article is streamed as a line of JSON and that the
+        number of queries grows per chunk rather than per article.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response, content = self.export(**self.headers)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([row['title'] for row in rows],
+                         ['Article {}'.format(index) for index in range(5)])
+        # 3 chunks and a final empty one, each with its prefetches
+        self.assertLess(len(queries), 25)
+
+    def test_export_is_gzipped_when_accepted(self):
+        """
+        Tests that the export is compressed for clients accepting gzip.
+        """
+        response, content = self.export(HTTP_ACCEPT_ENCODING='gzip',
+                                        **self.headers)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            len(gzip.decompress(content).decode().splitlines()), 5)
+
+    def test_export_articles_updated_since(self):
+        """
+        Tests that an incremental export only holds the updated articles.
+        """
+        since = timezone.now()
+        Article.objects.filter(title='Article 4').update(
+            changed_at=since + timezone.timedelta(seconds=1))
+        response, content = self.export(
+            data={'updated_since': since.isoformat()}, **self.headers)
+        self.assertEqual(len(content.splitlines()), 1)
+        response = self.client.get(
+            self.export_url, {'updated_since': 'yesterday'}, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_changes_since(self):
+        """
+        Tests that an incremental export holds the articles whose counters
+        changed and a line for each deleted article.
+        """
+        since = timezone.now()
+        liked, deleted = Article.objects.order_by('pk')[:2]
+        liked.update_counters(likes_count=1)
+        deleted.delete()
+        response, content = self.export(
+            data={'updated_since': since.isoformat()}, **self.headers)
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([row['slug'] for row in rows],
+                         [liked.slug, deleted.slug])
+        self.assertEqual(rows[0]['likesCount'], 1)
+        self.assertTrue(rows[1]['deleted'])
+        response, content = self.export(**self.headers)
+        self.assertEqual(len(content.splitlines()), 4)
@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .base_setup import Base
+from ..models import Article, TimelineEntry
+from ..tasks import fan_out_article
+from authors.apps.authentication.models import User
+
+
+class ArticleFeedTests(Base):
+    """Test suite for the feed of articles of followed authors."""
+
+    def setUp(self):
+        super().setUp()
+        self.author = User.objects.get(username=self.user_data['username'])
+        self.reader = User.objects.create_user(
+            'reader', 'reader@gmail.com', 'reader1990')
+        self.other = User.objects.create_user(
+            'other', 'other@gmail.com', 'other1990')
+        self.reader.profile.follow(self.author.profile)
+        self.feed_url = reverse('articles:feed')
+
+    def tearDown(self):
+        super().tearDown()
+
+    def publish(self, author, title):
+        return Article.objects.create(
+            title=title, body='body', description='description',
+            author=author)
+
+    def feed(self):
+        self.client.force_authenticate(self.reader)
+        response = self.client.get(self.feed_url)
+        self.client.force_authenticate(None)
+        return [article['title'] for article in response.data['results']]
+
+    def test_feed_holds_articles_of_followed_authors(self):
+        """
+        Tests that articles are pushed to the followers of their author,
+        latest first, and that the feed costs the same for more articles.
+        """
+        self.publish(self.author, 'First')
+        self.publish(self.other, 'Not followed')
+        self.client.force_authenticate(self.reader)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.feed_url)
+        self.publish(self.author, 'Second')
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.feed_url)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(self.feed(), ['Second', 'First'])
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.reader).count(), 2)
+        self.assertTrue(Article.objects.get(title='First').fanned_out)
+
+    def test_timeline_follows_the_follows(self):
+        """
+        Tests that following an author pushes their articles into the
+        timeline and unfollowing them takes their articles out.
+        """
+        self.publish(self.other, 'Earlier')
+        self.reader.profile.follow(self.other.profile)
+        self.assertEqual(self.feed(), ['Earlier'])
+        self.reader.profile.unfollow(self.other.profile)
+        self.assertEqual(self.feed(), [])
+
+    @override_settings(FEED_FANOUT_CHUNK_SIZE=1)
+    def test_articles_are_pushed_a_chunk_at_a_time(self):
+        """
+        Tests that every follower gets the article when it is pushed in
+        several chunks.
+        """
+        self.other.profile.follow(self.author.profile)
+        article = self.publish(self.author, 'Chunked')
+        self.assertEqual(
+            set(TimelineEntry.objects.filter(article=article).values_list(
+                'user', flat=True)), {self.reader.pk, self.other.pk})
+
+    def test_followers_joining_during_a_fan_out_get_the_article(self):
+        """
+        Tests that following an author whose article is still being pushed
+        pushes it too, and that the push then skips the new follower.
+        """
+        with override_settings(TASKS_EAGER=False):
+            article = self.publish(self.author, 'In flight')
+        self.other.profile.follow(self.author.profile)
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.other, article=article).exists())
+        fan_out_article(article_id=article.pk)
+        self.assertEqual(
+            sorted(TimelineEntry.objects.filter(article=article).values_list(
+                'user', flat=True)), sorted([self.reader.pk, self.other.pk]))
+
+    @override_settings(FEED_FANOUT_THRESHOLD=0)
+    def test_articles_of_popular_authors_are_read_from_the_follows(self):
+        """
+        Tests that articles of authors with too many followers are not
+        pushed but still appear in the feeds of their followers.
+        """
+        article = self.publish(self.author, 'Popular')
+        self.assertFalse(TimelineEntry.objects.exists())
+        article.refresh_from_db()
+        self.assertFalse(article.fanned_out)
+        self.assertEqual(self.feed(), ['Popular'])
+
+    @override_settings(FEED_FANOUT_THRESHOLD=1)
+    def test_feed_pages_merge_pushed_and_popular_articles(self):
+        """
+        Tests that paging through a feed goes through the pushed articles
+        and those of popular authors in order, each once.
+        """
+        self.other.profile.follow(self.author.profile)
+        self.reader.profile.follow(self.other.profile)
+        for index in range(3):
+            self.publish(self.author, 'Popular {}'.format(index))
+            self.publish(self.other, 'Pushed {}'.format(index))
+        self.assertFalse(TimelineEntry.objects.filter(
+            article__author=self.author).exists())
+
+        self.client.force_authenticate(self.reader)
+        titles = []
+        url = self.feed_url + '?page_size=4'
+        while url:
+            response = self.client.get(url)
+            titles += [article['title']
+                       for article in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(titles, [
+            'Pushed 2', 'Popular 2', 'Pushed 1', 'Popular 1',
+            'Pushed 0', 'Popular 0'])
+        response = self.client.get(self.feed_url + '?cursor=nonsense')
+        self.assertEqual(response.status_code, 404)
@@ -1,6 +1,10 @@
+from io import StringIO
+
 from rest_framework import status
+from django.core.management import call_command
 from django.urls import reverse
 from .base_setup import Base
+from ..models import Article
 
 
 class ArticleLikeTests(Base):
@@ -128,3 +132,28 @@ class ArticleLikeTests(Base):
                                     **self.headers
                                     )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_like_counters_follow_user_opinion(self):
+        """
+        Tests that the likes and dislikes counters of an article are updated
+        when a user likes it and then changes mind to dislike it
+        """
+        self.client.post(self.likes_dislikes_url, format="json",
+                         data=self.like, **self.headers)
+        article = Article.objects.get(slug=self.article_slug)
+        self.assertEqual((article.likes_count, article.dislikes_count), (1, 0))
+        self.client.post(self.likes_dislikes_url, format="json",
+                         data=self.dislike, **self.headers)
+        article.refresh_from_db()
+        self.assertEqual((article.likes_count, article.dislikes_count), (0, 1))
+
+    def test_rebuild_article_counters(self):
+        """
+        Tests that the counters of an article can be rebuilt from its likes
+        """
+        self.client.post(self.likes_dislikes_url, format="json",
+                         data=self.like, **self.headers)
+        Article.objects.update(likes_count=10, dislikes_count=3)
+        call_command('rebuild_article_counters', stdout=StringIO())
+        article = Article.objects.get(slug=self.article_slug)
+        self.assertEqual((article.likes_count, article.dislikes_count), (1, 0))
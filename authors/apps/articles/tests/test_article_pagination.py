@@ -49,3 +49,22 @@ class PaginationTests(Base):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['next'], None)
+
+    def test_cursor_pagination(self):
+        """ Test paging through articles with cursors """
+        for _ in range(4):
+            self.client.post(self.article_url, self.article_data,
+                             format="json", **self.headers)
+        slugs = []
+        pages = 0
+        url = self.article_url + '?pagination=cursor&page_size=2'
+        while url:
+            response = self.client.get(url, format="json", **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            slugs += [article['slug'] for article in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(slugs), 5)
+        self.assertEqual(len(set(slugs)), 5)
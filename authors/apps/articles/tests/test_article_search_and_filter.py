@@ -67,3 +67,69 @@ class SearchFilterTests(Base):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(str.lower(response.data['results'][0]['article_tags'][0]),str.lower(tag))
+
+    def test_full_text_search(self):
+        """ Test articles are found by the words in them and highlighted """
+        self.client.post(self.article_url, {
+            "title": "Learning Python",
+            "description": "Notes on snakes and code",
+            "body": "Python makes writing code enjoyable",
+            "tags": "programming"
+        }, format="json", **self.headers)
+        response = self.client.get(
+            self.article_url + '?q=python code', format="json", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['highlight']['title'],
+                         'Learning <em>Python</em>')
+
+        response = self.client.get(
+            self.article_url + '?q=programming', format="json", **self.headers)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_highlights_escape_the_article_text(self):
+        """ Test markup written in articles is escaped in highlights """
+        self.client.post(self.article_url, {
+            "title": "Python <script>alert(1)</script>",
+            "description": "Notes",
+            "body": "Python & <b>code</b>"
+        }, format="json", **self.headers)
+        response = self.client.get(
+            self.article_url + '?q=python', format="json", **self.headers)
+        highlight = response.data['results'][0]['highlight']
+        self.assertEqual(
+            highlight['title'],
+            '<em>Python</em> &lt;script&gt;alert(1)&lt;/script&gt;')
+        self.assertIn('&amp; &lt;b&gt;code&lt;/b&gt;', highlight['body'])
+
+    def test_full_text_search_ranks_title_matches_first(self):
+        """ Test articles matching the query in their title rank highest """
+        self.client.post(self.article_url, {
+            "title": "A story",
+            "description": "Joining",
+            "body": "Journey after journey"
+        }, format="json", **self.headers)
+        response = self.client.get(
+            self.article_url + '?q=journey', format="json", **self.headers)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['results'][0]['title'],
+                         self.article_data['title'])
+
+    def test_search_matches_authors_titles_and_tags(self):
+        """ Test ?search= still matches part of the author, title or tags """
+        self.client.post(self.article_url, {
+            "title": "Learning Python",
+            "description": "Notes on snakes",
+            "body": "Python makes writing code enjoyable"
+        }, format="json", **self.headers)
+        response = self.client.get(
+            self.article_url + '?search=adm', format="json", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        response = self.client.get(
+            self.article_url + '?search=pyth', format="json", **self.headers)
+        self.assertEqual(response.data['count'], 1)
+        self.assertNotIn('highlight', response.data['results'][0])
+        response = self.client.get(
+            self.article_url + '?search=andel', format="json", **self.headers)
+        self.assertEqual(response.data['count'], 2)
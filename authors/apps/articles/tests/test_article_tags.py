@@ -0,0 +1,111 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .base_setup import Base
+from ..models import Article, ArticleTags
+from ..views import create_tag
+from authors.apps.core.cron import TagCountsCron
+
+
+class ArticleTagsTests(Base):
+    """Test suite for tagging articles."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post(
+            self.article_url, dict(self.article_data, tags='python'),
+            format="json", **self.headers)
+        self.article = Article.objects.get(slug=response.data['slug'])
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_tags_are_matched_by_normalized_slug(self):
+        """
+        Tests that tags are the same whatever their case or spacing, and
+        that a tag is not matched by part of another or without its symbols.
+        """
+        create_tag(' Python ,py, Machine Learning,machine-learning,C++,C#,c',
+                   self.article)
+        self.assertEqual(
+            sorted(self.article.article_tags.values_list('slug', flat=True)),
+            ['c', 'c#', 'c++', 'machine learning', 'py', 'python'])
+        self.assertEqual(ArticleTags.objects.count(), 6)
+        self.assertEqual(
+            ArticleTags.objects.get(slug='python').tag, 'python')
+
+    def test_tagging_costs_the_same_for_any_number_of_tags(self):
+        """
+        Tests that resolving and attaching tags takes a fixed number of
+        queries rather than a few per tag.
+        """
+        def queries_for(tags):
+            article = Article.objects.create(
+                title='Tagged', body='body', description='description',
+                author=self.article.author)
+            with CaptureQueriesContext(connection) as queries:
+                create_tag(tags, article)
+            return len(queries)
+
+        few = queries_for('one,two')
+        many = queries_for(','.join('tag{}'.format(i) for i in range(30)))
+        self.assertEqual(few, many)
+
+    def test_tag_counts_follow_tagging(self):
+        """
+        Tests that the materialized article counts change as articles are
+        tagged, untagged and deleted, from either side of the links.
+        """
+        other = Article.objects.create(
+            title='Other', body='body', description='description',
+            author=self.article.author)
+        create_tag('python,django', other)
+
+        def counts():
+            return dict(ArticleTags.objects.values_list(
+                'slug', 'article_count'))
+
+        self.assertEqual(counts(), {'python': 2, 'django': 1})
+        django = ArticleTags.objects.get(slug='django')
+        other.article_tags.remove(django)
+        self.assertEqual(counts(), {'python': 2, 'django': 0})
+        # links which do not exist are not uncounted
+        other.article_tags.remove(django)
+        self.assertEqual(counts(), {'python': 2, 'django': 0})
+        django.article_set.add(self.article, other)
+        self.assertEqual(counts(), {'python': 2, 'django': 2})
+        django.article_set.clear()
+        self.assertEqual(counts(), {'python': 2, 'django': 0})
+        self.article.article_tags.clear()
+        self.assertEqual(counts(), {'python': 1, 'django': 0})
+        other.delete()
+        self.assertEqual(counts(), {'python': 0, 'django': 0})
+
+    def test_list_tags_by_count_and_trend(self):
+        """
+        Tests that tags in use are listed most used first, or most
+        trending first when asked.
+        """
+        old = Article.objects.create(
+            title='Old', body='body', description='description',
+            author=self.article.author)
+        create_tag('django,python', old)
+        Article.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timezone.timedelta(days=20))
+        create_tag('flask', self.article)
+        ArticleTags.objects.create(tag='unused')
+        TagCountsCron().do()
+
+        response = self.client.get(reverse('tags'), {'page_size': 10})
+        self.assertEqual(
+            [(tag['tag'], tag['article_count'], tag['trending_score'])
+             for tag in response.data['results']],
+            [('python', 2, 4), ('django', 1, 1), ('flask', 1, 3)])
+        response = self.client.get(
+            reverse('tags'), {'ordering': 'trending', 'page_size': 10})
+        self.assertEqual(
+            [tag['tag'] for tag in response.data['results']],
+            ['python', 'flask', 'django'])
+        self.assertIn(b'"tags"', response.content)
@@ -0,0 +1,112 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from .base_setup import Base
+from ..models import Article, Comment
+from ..threads import load_replies
+from authors.apps.authentication.models import User
+
+
+class CommentThreadsTests(Base):
+    """Test suite for retrieving threads of comments."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post(self.article_url, self.article_data,
+                                    format="json", **self.headers)
+        self.article = Article.objects.get(slug=response.data['slug'])
+        self.user = User.objects.get(username=self.user_data['username'])
+        self.threads_url = reverse(
+            'articles:comment_threads', kwargs={'slug': self.article.slug})
+
+    def tearDown(self):
+        super().tearDown()
+
+    def comment(self, body, parent=None):
+        return Comment.objects.create(
+            article=self.article, commented_by=self.user, comment_body=body,
+            parent=parent)
+
+    def threads(self, **params):
+        response = self.client.get(self.threads_url, params, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+    def test_comments_record_their_thread(self):
+        """
+        Tests that comments know their path, depth and number of replies,
+        also after a reply is deleted.
+        """
+        first = self.comment('first')
+        reply = self.comment('reply', first)
+        self.comment('another reply', first)
+        nested = self.comment('nested', reply)
+        first.refresh_from_db()
+        self.assertEqual(nested.path, '{:010d}/{:010d}/{:010d}/'.format(
+            first.pk, reply.pk, nested.pk))
+        self.assertEqual((first.depth, nested.depth), (0, 2))
+        self.assertEqual(first.reply_count, 2)
+        reply.delete()
+        first.refresh_from_db()
+        self.assertEqual(first.reply_count, 1)
+
+    def test_threads_are_nested_in_constant_queries(self):
+        """
+        Tests that the threads of a page are nested down to the asked depth
+        with a fixed number of queries.
+        """
+        first = self.comment('first')
+        reply = self.comment('reply', first)
+        nested = self.comment('nested', reply)
+        self.comment('too deep', nested)
+        self.comment('second')
+
+        with CaptureQueriesContext(connection) as queries:
+            threads = self.threads(depth=2)
+        self.assertEqual([thread['comment_body'] for thread in threads],
+                         ['first', 'second'])
+        replies = threads[0]['replies']
+        self.assertEqual(replies[0]['comment_body'], 'reply')
+        self.assertEqual(replies[0]['reply_count'], 1)
+        self.assertEqual(replies[0]['replies'][0]['comment_body'], 'nested')
+        self.assertEqual(replies[0]['replies'][0]['replies'], [])
+
+        for index in range(10):
+            self.comment('reply {}'.format(index), self.comment('more'))
+        with CaptureQueriesContext(connection) as more_queries:
+            self.threads(depth=2)
+        self.assertEqual(len(queries), len(more_queries))
+
+    def test_replies_are_paginated_per_comment(self):
+        """
+        Tests that only the first replies of each comment are nested, and
+        that the following ones are retrieved as the threads of the comment.
+        """
+        first = self.comment('first')
+        for index in range(4):
+            self.comment('reply {}'.format(index), first)
+        threads = self.threads(replies=2)
+        self.assertEqual(
+            [reply['comment_body'] for reply in threads[0]['replies']],
+            ['reply 0', 'reply 1'])
+        self.assertEqual(threads[0]['reply_count'], 4)
+        # the replies left out are not loaded at all
+        self.assertEqual(
+            [reply.comment_body for reply in load_replies([first], 3, 2)],
+            ['reply 0', 'reply 1'])
+
+        threads = self.threads(parent=first.pk, page=2, page_size=2)
+        self.assertEqual([thread['comment_body'] for thread in threads],
+                         ['reply 2', 'reply 3'])
+
+    def test_invalid_thread_limits(self):
+        """
+        Tests that limits which are not numbers in range are rejected.
+        """
+        for params in ({'depth': 11}, {'replies': 'all'}, {'parent': 'x'}):
+            response = self.client.get(
+                self.threads_url, params, **self.headers)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,7 +1,11 @@
 from .base_setup import Base
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from authors.apps.authentication.backends import generate_jwt_token
+from authors.apps.authentication.models import User
+from ..models import Article, Comment
 
 
 class CommentTest(Base):
@@ -61,7 +65,7 @@ class CommentTest(Base):
         list_comment_response = self.client.get(self.comments_url,
                                                 self.article_data, format='json',
                                                 **self.headers)
-        self.assertEqual(len(list_comment_response.data), 1)
+        self.assertEqual(len(list_comment_response.data['results']), 1)
         self.assertEqual(list_comment_response.status_code, status.HTTP_200_OK)
 
         # User provides invalid comment id
@@ -143,3 +147,33 @@ class CommentTest(Base):
         comment_response = self.client.get(
             comment_url, format='json', **self.headers)
         self.assertEqual(comment_response.status_code, status.HTTP_200_OK)
+
+    def test_comments_page_in_constant_queries(self):
+        """
+        Test comments are paged through oldest first with the same number
+        of queries whatever the number of comments
+        """
+        article = Article.objects.get(slug=self.slug.data['slug'])
+        user = User.objects.get(username=self.user_data['username'])
+
+        def page_queries(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, **self.headers)
+            return response, len(queries)
+
+        Comment.objects.create(
+            article=article, commented_by=user, comment_body='comment 0')
+        few = page_queries(self.comments_url)[1]
+        Comment.objects.bulk_create(
+            Comment(article=article, commented_by=user,
+                    comment_body='comment {}'.format(index))
+            for index in range(1, 50))
+        response, many = page_queries(self.comments_url + '?page_size=20')
+        self.assertEqual(few, many)
+        self.assertEqual(
+            [comment['comment_body'] for comment in response.data['results']],
+            ['comment {}'.format(index) for index in range(20)])
+        response, deeper = page_queries(response.data['next'])
+        self.assertEqual(response.data['results'][0]['comment_body'],
+                         'comment 20')
+        self.assertEqual(few, deeper)
@@ -41,6 +41,8 @@ class ArticleDeleteUpdateTests(Base):
             format="json",
             **self.headers)
         self.assertEqual(unfavourite.status_code, status.HTTP_200_OK)
+        self.assertEqual(favourite.data['article']['favouritesCount'], 1)
+        self.assertEqual(unfavourite.data['article']['favouritesCount'], 0)
 
     def test_favourite_non_existing_article(self):
         """
@@ -1,10 +1,15 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from .base_setup import Base
 
 from authors.apps.authentication.backends import generate_jwt_token
-from authors.apps.articles.models import ArticleRating
+from authors.apps.articles.models import Article, ArticleRating
 
 
 class ArticleRatingTests(Base):
@@ -94,6 +99,65 @@ class ArticleRatingTests(Base):
         self.assertEqual(update_response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(ArticleRating.objects.count(), ratings_count)
 
+    def login(self, user_data):
+        self.client.post(self.registration_url, user_data, format='json')
+        self.client.get(reverse(
+            "authentication:activate_user",
+            args=[generate_jwt_token(user_data['username'])]))
+        response = self.client.post(self.login_url, user_data, format='json')
+        return {'HTTP_AUTHORIZATION': 'Bearer {}'.format(
+            response.data['token'])}
+
+    def rate(self, rating, headers):
+        return self.client.post(
+            reverse('articles:rate', kwargs={'slug': self.slug}),
+            {'rating': rating}, format="json", **headers)
+
+    def test_rating_counters_follow_ratings(self):
+        """
+        Tests that the sum, count, histogram and average of the ratings of an
+        article are kept as users rate it and change their rating, without
+        aggregating its ratings
+        """
+        other = self.login({
+            "username": "rater",
+            "email": "rater@gmail.com",
+            "password": "rater1990",
+        })
+        with CaptureQueriesContext(connection) as queries:
+            self.rate(4, self.headers)
+        self.assertFalse([query for query in queries
+                          if 'AVG(' in query['sql'].upper()])
+        self.rate(2, other)
+        self.rate(5, self.headers)
+        article = Article.objects.get(slug=self.slug)
+        self.assertEqual((article.rating_sum, article.rating_count), (7, 2))
+        self.assertEqual(float(article.rating_average), 3.5)
+        self.assertEqual(
+            article.rating_histogram,
+            {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1})
+        response = self.client.get(
+            reverse('articles:retrieveUpdateDelete', kwargs={'slug': self.slug}))
+        self.assertEqual(response.data['ratingsCount'], 2)
+        self.assertEqual(response.data['rating_histogram']['5'], 1)
+
+    def test_rebuild_rating_counters(self):
+        """
+        Tests that the rating counters of an article can be rebuilt from its
+        ratings
+        """
+        self.rate(3, self.headers)
+        Article.objects.update(
+            rating_sum=40, rating_count=9, rating_1_count=9,
+            rating_average=4.4)
+        call_command('rebuild_article_counters', stdout=StringIO())
+        article = Article.objects.get(slug=self.slug)
+        self.assertEqual((article.rating_sum, article.rating_count), (3, 1))
+        self.assertEqual(float(article.rating_average), 3)
+        self.assertEqual(
+            article.rating_histogram,
+            {'1': 0, '2': 0, '3': 1, '4': 0, '5': 0})
+
     def test_unsuccessful_rating_with_negative_rate_value(self):
         """
         Tests if a user can rate a specific article with a negative value
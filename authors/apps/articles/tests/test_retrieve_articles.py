@@ -1,5 +1,7 @@
 from .base_setup import Base
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 
@@ -48,3 +50,23 @@ class ArticleTests(Base):
                 kwargs={'slug': self.non_existing_article_slug}),
             format="json", **self.headers)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_listing_articles_costs_constant_queries(self):
+        """
+        Tests that the number of queries for a page of articles does not grow
+        with the number of articles on the page
+        """
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(self.article_url, format="json", **self.headers)
+        for _ in range(5):
+            slug = self.client.post(self.article_url, self.article_data,
+                                    format="json", **self.headers).data['slug']
+            self.client.post(
+                reverse('articles:favourite_article', kwargs={'slug': slug}),
+                format="json", **self.headers)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(
+                self.article_url, format="json", **self.headers)
+        self.assertEqual(len(single), len(many))
+        self.assertEqual(response.data["results"][0]['favouritesCount'], 1)
+        self.assertTrue(response.data["results"][0]['favourite'])
@@ -1,6 +1,10 @@
+from io import StringIO
+
 from .base_setup import Base
 from rest_framework import status
+from django.core.management import call_command
 from django.urls import reverse
+from ..models import Article
 
 
 class ArticleReadTime(Base):
@@ -24,3 +28,23 @@ class ArticleReadTime(Base):
                                    format="json", **self.headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data['time_to_read'] == self.time_to_read)
+
+    def test_read_time_is_stored_with_the_article(self):
+        """
+        Tests that the word count and read time are updated with the body
+        """
+        body = ' '.join(['word'] * 600)
+        self.client.put(self.retrieve_update_delete_url,
+                        dict(self.article_data, body=body),
+                        format="json", **self.headers)
+        article = Article.objects.get(slug=self.article_slug)
+        self.assertEqual((article.word_count, article.read_time), (600, 2))
+
+    def test_count_article_words_command(self):
+        """
+        Tests that existing articles can have their read time backfilled
+        """
+        Article.objects.update(word_count=0, read_time=9)
+        call_command('count_article_words', stdout=StringIO())
+        article = Article.objects.get(slug=self.article_slug)
+        self.assertEqual((article.word_count, article.read_time), (6, 1))
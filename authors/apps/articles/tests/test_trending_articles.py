@@ -0,0 +1,115 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .base_setup import Base
+from ..models import (
+    Article, Bookmark, Comment, Likes, TrendingScore, TrendingWatermark)
+from ..trending import update_scores
+from authors.apps.authentication.models import User
+from authors.apps.core.cron import TrendingArticlesCron
+
+
+class TrendingArticlesTests(Base):
+    """Test suite for ranking articles by their recent engagement."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.get(username=self.user_data['username'])
+        self.now = timezone.now()
+        self.commented = self.publish('Commented')
+        self.liked = self.publish('Liked')
+        self.url = reverse('articles:trending')
+
+    def tearDown(self):
+        super().tearDown()
+
+    def publish(self, title):
+        return Article.objects.create(
+            title=title, body='body', description='description',
+            author=self.user)
+
+    def trending(self):
+        response = self.client.get(self.url)
+        return [article['title'] for article in response.data['results']]
+
+    def scores(self):
+        return dict(TrendingScore.objects.values_list('article', 'score'))
+
+    def test_engagement_decays_with_age(self):
+        """
+        Tests that engagement weighs less the older it is, so that older
+        engagement is overtaken by newer.
+        """
+        comment = Comment.objects.create(
+            article=self.commented, commented_by=self.user,
+            comment_body='comment')
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=self.now - timezone.timedelta(hours=48))
+        Likes.objects.create(article=self.liked, user=self.user, like=True)
+        self.assertEqual(update_scores(self.now), (2, 2))
+        scores = self.scores()
+        # a comment weighs 3, halved twice, and a like 1
+        self.assertAlmostEqual(scores[self.commented.pk], 0.75, places=3)
+        self.assertAlmostEqual(scores[self.liked.pk], 1, places=3)
+        self.assertEqual(self.trending(), ['Liked', 'Commented'])
+
+        later = self.now + timezone.timedelta(hours=24)
+        Bookmark.objects.create(article=self.commented, user=self.user)
+        Bookmark.objects.filter(article=self.commented).update(
+            created_at=later)
+        self.assertEqual(update_scores(later), (1, 1))
+        scores = self.scores()
+        self.assertAlmostEqual(scores[self.commented.pk], 2.375, places=3)
+        self.assertAlmostEqual(scores[self.liked.pk], 0.5, places=3)
+        self.assertEqual(self.trending(), ['Commented', 'Liked'])
+
+    def test_faded_articles_stop_trending(self):
+        """
+        Tests that articles drop out once their engagement has faded, and
+        that engagement is only counted once.
+        """
+        self.liked.favourited.add(self.user)
+        TrendingArticlesCron().do()
+        self.assertEqual(self.trending(), ['Liked'])
+        self.assertEqual(
+            TrendingWatermark.objects.get(source='favourites').last_id,
+            Article.favourited.through.objects.get().pk)
+        update_scores(self.now + timezone.timedelta(days=30))
+        self.assertFalse(TrendingScore.objects.exists())
+        self.assertEqual(self.trending(), [])
+
+    def test_trending_articles_are_served_from_the_cache(self):
+        """
+        Tests that the ranking is read from the cache, and that a page costs
+        the same for more articles.
+        """
+        Likes.objects.create(article=self.liked, user=self.user, like=True)
+        update_scores()
+        with CaptureQueriesContext(connection) as few:
+            self.trending()
+        Likes.objects.create(
+            article=self.commented, user=self.user, like=True)
+        update_scores()
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.trending()), 2)
+        self.assertEqual(len(few), len(many))
+        self.assertNotIn('trendingscore', ' '.join(
+            query['sql'] for query in many.captured_queries))
+
+    @override_settings(TRENDING_EVERY_MINS=0)
+    def test_cached_ranking_expires(self):
+        """
+        Tests that the cached ranking is read again from the scores once it
+        expires, so that scores updated by another process are served.
+        """
+        Likes.objects.create(article=self.liked, user=self.user, like=True)
+        update_scores()
+        self.assertEqual(self.trending(), ['Liked'])
+        # the scores as updated by the cron job of another process
+        TrendingScore.objects.create(article=self.commented, score=5)
+        self.assertEqual(self.trending(), ['Commented', 'Liked'])
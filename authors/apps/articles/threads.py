@@ -0,0 +1,65 @@
+"""
+Threads of comments.
+
+Every comment records the path of ids from the first comment of its thread
+down to itself, so that a thread is listed depth first when ordered by
+path, and the number of its direct replies, kept current here as replies
+are deleted.
+"""
+from operator import attrgetter
+
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Comment
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_deleted_reply(sender, instance, **kwargs):
+    # replies deleted along with their parent update no row
+    if instance.parent_id:
+        Comment.objects.filter(pk=instance.parent_id).update(
+            reply_count=F('reply_count') - 1)
+
+
+def load_replies(comments, depth, replies_per_comment):
+    """
+    Load the replies to the comments down to `depth` levels below them,
+    with one query per level returning only the first `replies_per_comment`
+    replies of every comment, ordered by path.
+    """
+    first_replies = Comment.objects.filter(
+        parent=OuterRef('parent')).order_by('pk').values('pk')[
+            :replies_per_comment]
+    replies = []
+    parents = [comment.pk for comment in comments]
+    for _ in range(depth):
+        if not parents:
+            break
+        level = list(Comment.objects.filter(
+            parent__in=parents, pk__in=Subquery(first_replies)))
+        replies.extend(level)
+        parents = [reply.pk for reply in level if reply.reply_count]
+    return sorted(replies, key=attrgetter('path'))
+
+
+def nest_replies(comments, replies, replies_per_comment):
+    """
+    Nest the serialized `replies`, ordered by path, under the serialized
+    `comments` they answer, keeping the first `replies_per_comment` replies
+    of every comment. Replies to the ones left out are left out too, their
+    parents' `reply_count` tells there is more to page through.
+    """
+    nodes = {}
+    for comment in comments:
+        comment['replies'] = []
+        nodes[comment['id']] = comment
+    for reply in replies:
+        parent = nodes.get(reply['parent'])
+        if parent is None or len(parent['replies']) >= replies_per_comment:
+            continue
+        reply['replies'] = []
+        parent['replies'].append(reply)
+        nodes[reply['id']] = reply
+    return comments
@@ -0,0 +1,137 @@
+"""
+Trending articles: articles ranked by their recent engagement.
+
+Every like, favourite, rating, comment and bookmark adds its weight to the
+trending score of its article, halved every `TRENDING_HALF_LIFE_HOURS` since
+it happened. Scores are kept in `TrendingScore` by `update_scores`, which
+`TrendingArticlesCron` runs: it decays the stored scores by the time since
+the last run and adds the engagement which happened since, read past the
+id of the last row it counted of each kind. Articles whose score fades
+below `MIN_SCORE` are dropped, so the table only holds articles engaged
+with recently.
+
+Only comments and bookmarks record when they were made. Other engagement
+is dated to the previous run, or to the creation of its article when
+first counted, which is the earliest it can have happened. Engagement
+which is undone is not taken back out; it fades like the rest.
+
+The ids of the most trending articles are cached for `TRENDING_EVERY_MINS`,
+after which they are read again from the score index, so that every
+process serving them picks up the run of the cron job, whatever the cache.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from .models import (
+    Article, ArticleRating, Bookmark, Comment, Likes, TrendingScore,
+    TrendingWatermark)
+
+# kinds of engagement: the rows, their weight and when they were made, if
+# they record it
+SOURCES = (
+    ('likes', Likes.objects.filter(like=True), 1.0, None),
+    ('favourites', Article.favourited.through.objects.all(), 2.0, None),
+    ('ratings', ArticleRating.objects.all(), 1.0, None),
+    ('comments', Comment.objects.all(), 3.0, 'created_at'),
+    ('bookmarks', Bookmark.objects.all(), 2.0, 'created_at'),
+)
+# scores below which articles are no longer trending
+MIN_SCORE = 0.01
+# counts read at a time, and articles whose scores are written at a time
+CHUNK_SIZE = 2000
+WRITE_BATCH_SIZE = 500
+CACHE_KEY = 'articles:trending'
+
+
+def decay(seconds):
+    """
+    Return what is left of engagement after the given number of seconds.
+    """
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 60 * 60
+    return 0.5 ** (max(seconds, 0) / half_life)
+
+
+def update_scores(now=None):
+    """
+    Bring the trending scores up to `now`, counting the engagement since
+    the last update. Return the number of engagements counted and the
+    number of articles which gained from them.
+    """
+    now = now or timezone.now()
+    watermarks = TrendingWatermark.objects.in_bulk()
+    gained = defaultdict(float)
+    counted = 0
+    with transaction.atomic():
+        scored_at = min(
+            (mark.scored_at for mark in watermarks.values()), default=None)
+        if scored_at is not None:
+            TrendingScore.objects.update(
+                score=F('score') * decay((now - scored_at).total_seconds()))
+        TrendingScore.objects.filter(score__lt=MIN_SCORE).delete()
+
+        for source, rows, weight, time_field in SOURCES:
+            mark = watermarks.get(source) or TrendingWatermark(source=source)
+            rows = rows.filter(pk__gt=mark.last_id)
+            last_id = rows.aggregate(last_id=Max('pk'))['last_id']
+            if last_id is not None:
+                # rows are counted by article and time, which is the same
+                # for all the rows of an article when they do not record it
+                made = time_field or 'article__created_at'
+                grouped = rows.filter(pk__lte=last_id).order_by().values(
+                    'article_id', made).annotate(
+                        count=Count('pk')).values_list(
+                            'article_id', made, 'count')
+                for article_id, made_at, count in grouped.iterator(
+                        chunk_size=CHUNK_SIZE):
+                    if time_field is None and mark.scored_at is not None:
+                        made_at = max(made_at, mark.scored_at)
+                    gained[article_id] += count * weight * decay(
+                        (now - made_at).total_seconds())
+                    counted += count
+                mark.last_id = last_id
+            mark.scored_at = now
+            mark.save()
+
+        articles = sorted(gained)
+        for start in range(0, len(articles), WRITE_BATCH_SIZE):
+            batch = articles[start:start + WRITE_BATCH_SIZE]
+            # articles deleted since their engagement was read are left out
+            existing = set(Article.objects.filter(
+                pk__in=batch).values_list('pk', flat=True))
+            scores = TrendingScore.objects.filter(article_id__in=batch)
+            current = dict(scores.values_list('article_id', 'score'))
+            scores.delete()
+            merged = (
+                (pk, current.get(pk, 0) + gained[pk])
+                for pk in batch if pk in existing)
+            TrendingScore.objects.bulk_create(
+                TrendingScore(article_id=pk, score=score)
+                for pk, score in merged if score >= MIN_SCORE)
+    cache_trending()
+    return counted, len(gained)
+
+
+def cache_trending():
+    """
+    Cache and return the ids of the `TRENDING_SIZE` most trending articles
+    until the scores are next updated.
+    """
+    ids = list(TrendingScore.objects.order_by('-score').values_list(
+        'article_id', flat=True)[:settings.TRENDING_SIZE])
+    cache.set(CACHE_KEY, ids, settings.TRENDING_EVERY_MINS * 60)
+    return ids
+
+
+def trending_ids():
+    """
+    Return the ids of the most trending articles, most trending first.
+    """
+    ids = cache.get(CACHE_KEY)
+    if ids is None:
+        ids = cache_trending()
+    return ids
@@ -3,12 +3,19 @@ from .views import (
     RetrieveCommentAPIView, ListCreateCommentAPIView, ArticleAPIView,
     ArticleDetailsView, ArticleLikes, FavoriteArticle, ArticleRatingAPIView,
     ArticleReportAPIView, ArticleReportRUDAPIView, ArticleBookmarkAPIView,
-    ArticleBookmarkDetailAPIView, RetrieveCommentsofAPIView)
+    ArticleBookmarkDetailAPIView, RetrieveCommentsofAPIView,
+    ArticleCacheStatsAPIView, ArticleExportAPIView, CommentThreadsAPIView,
+    FeedAPIView, TrendingAPIView)
 
 app_name = 'articles'
 
 urlpatterns = [
     path('', ArticleAPIView.as_view(), name='create'),
+    path('export/', ArticleExportAPIView.as_view(), name='export'),
+    path('feed/', FeedAPIView.as_view(), name='feed'),
+    path('trending/', TrendingAPIView.as_view(), name='trending'),
+    path('cache/stats/', ArticleCacheStatsAPIView.as_view(),
+         name='cache_stats'),
     path('<str:slug>/rate/', ArticleRatingAPIView.as_view(),
          name='rate'),
     path(
@@ -29,6 +36,8 @@ urlpatterns = [
          name='reportRetrieveUpdateDestroy'),
 
     path('<str:slug>/comments/', ListCreateCommentAPIView.as_view(), name='comments'),
+    path('<str:slug>/comments/threads/', CommentThreadsAPIView.as_view(),
+         name='comment_threads'),
     path('<str:slug>/comments/<pk>/',
          RetrieveCommentAPIView.as_view(), name='comment_detail'),
 
@@ -1,23 +1,31 @@
 """
 This module defines views used in CRUD operations on articles.
 """
-from rest_framework import generics, status
+from rest_framework import generics, mixins, status
 from rest_framework.response import Response
 from rest_framework.permissions import (
-    AllowAny, IsAuthenticatedOrReadOnly, IsAuthenticated
+    AllowAny, IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser
 )
 from rest_framework.serializers import ValidationError
-from datetime import datetime
+from rest_framework.utils.serializer_helpers import ReturnDict
+from itertools import chain
 from rest_framework.views import APIView
-from django.db.models import Avg
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.core.exceptions import ObjectDoesNotExist
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.text import compress_sequence
 from django.views.generic import ListView
 from rest_framework.views import APIView
 from rest_framework.renderers import JSONRenderer
 from rest_framework import authentication
-from .serializers import CommentSerializer, ArticleSerializer, ArticleRatingSerializer, LikesSerializer, TagsSerializer
+from .serializers import CommentSerializer, ArticleSerializer, ArticleRatingSerializer, LikesSerializer
 
 # Add pagination
 from rest_framework.pagination import PageNumberPagination
@@ -26,38 +34,38 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .renderers import ArticleJSONRenderer, BookmarkJSONRenderer
+from .pagination import (
+    ArticleCursorPagination, BookmarkCursorPagination, CommentCursorPagination,
+    CommentThreadPagination, FeedPagination, TagPagination,
+    TrendingPagination)
+from .renderers import (
+    ArticleJSONRenderer, BookmarkJSONRenderer, TagJSONRenderer)
 from .serializers import (
     ArticleSerializer, ArticleRatingSerializer, LikesSerializer, TagsSerializer,
-    ArticleReportSerializer, ArticleReportRetrieveSerializer, BookmarkSerializer
+    ArticleReportSerializer, ArticleReportRetrieveSerializer, BookmarkSerializer,
+    ArticleSearchSerializer, BookmarkListSerializer, CommentThreadSerializer
 )
+from .search import search_articles
+from .threads import load_replies, nest_replies
+from .export import export_articles, export_deletions
+from .feed import feed_page
+from .trending import trending_ids
+from . import cache as article_cache
 from .models import (
     Article, ArticleRating, Likes, ArticleTags, ArticleReport, Bookmark)
-from authors.apps.notifications.models import notify_follower
+from authors.apps.notifications.tasks import notify_followers_of_article
+from authors.apps.core.conditional import conditional_get, make_etag
 
 
 def create_tag(tags, article):
     """
-    This method checks whether a tag with tag provided exists in the database
-    and creates it if it does not exist.
-    :params str tag: name of the new tag or tag to query from the database
-    :returns cls object ArticleTags: the tag as retrieved from the database
+    Attach the comma separated tags to the article, creating the tags which
+    do not exist yet. Tags are matched by their normalized slug, so that
+    "Python" and "python" are the same tag while "py" is not "python", and
+    are all attached with a single insert.
+    :params str tags: comma separated names of the tags
     """
-    # retrieve all tag names and create new ones if they do not exist
-    # also, add them to the articles and save the article instance
-
-    for tag in tags.split(','):
-        article_tag = ArticleTags.objects.filter(tag__icontains=tag.strip())
-        if not article_tag:
-            data = {'tag': tag.strip()}
-            serializer = TagsSerializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            article_tag = serializer.save()
-            article.article_tags.add(article_tag)
-        else:
-            article.article_tags.add(article_tag.first())
-    article.save()
-    return None
+    article.article_tags.add(*ArticleTags.objects.resolve(tags.split(',')))
 
 
 
@@ -91,6 +99,48 @@ class ArticleAPIView(generics.ListCreateAPIView):
     search_fields = fields
     filter_fields = fields
 
+    @property
+    def paginator(self):
+        """
+        Use cursor pagination when the client opts in with
+        `?pagination=cursor` and page numbers otherwise.
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = ArticleCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_search_query(self):
+        """
+        Return the full text search query, passed as `?q=`. `?search=` is
+        left to `SearchFilter`, which matches the author, title and tags.
+        """
+        return self.request.query_params.get('q')
+
+    def get_queryset(self):
+        """
+        Load counts, tags and the user's favourite state with the articles
+        so that a page costs a constant number of queries. Articles are
+        narrowed down and ranked by the search query if there is one.
+        """
+        queryset = Article.objects.for_listing(self.request.user)
+        query = self.get_search_query()
+        if query:
+            queryset = search_articles(queryset, query)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.get_search_query():
+            return ArticleSearchSerializer
+        return self.serializer_class
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['search_query'] = self.get_search_query()
+        return context
+
     def post(self, request):
         """
         Creates an article
@@ -123,12 +173,11 @@ class ArticleAPIView(generics.ListCreateAPIView):
 @receiver(post_save, sender=Article)
 def notify_follower_reciever(sender, instance, created, **kwargs):
     """
-    Send a notification after the article being created is saved.
+    Queue notifications for the author's followers after the article being
+    created is saved.
     """
     if created:
-        message = (instance.author.username +
-                   " has created an article. Title: " + instance.title)
-        notify_follower(instance.author, message, instance)
+        notify_followers_of_article.delay(article_id=instance.pk)
 
 
 class ArticleDetailsView(generics.RetrieveUpdateDestroyAPIView):
@@ -147,17 +196,44 @@ class ArticleDetailsView(generics.RetrieveUpdateDestroyAPIView):
         except ObjectDoesNotExist:
             return None
 
+    def get_validators(self, request, slug):
+        """
+        Derive the ETag and modification time of the article from its cache
+        version, so that conditional requests need a single query.
+        """
+        self.version = article_cache.get_version(slug)
+        if self.version is None:
+            return None, None
+        etag = make_etag(slug, self.version.isoformat(), request.user.pk)
+        return etag, self.version
+
+    @conditional_get
     def get(self, request, slug):
         """
         Retrieve a specific article from the database given it's article id.
         :params str slug: a slug of an article you want to retrieve
         :returns article: a json data for the requested article
         """
-        article = self.get_object(slug)
+        data = self.version and article_cache.get_article(slug, self.version)
+        if data is not None:
+            # only the fields which depend on the reader are worked out
+            data = dict(data, favourite=request.user.is_authenticated and (
+                Article.favourited.through.objects.filter(
+                    article__slug=slug, user=request.user.pk).exists()))
+            response = Response(
+                ReturnDict(data, serializer=self.get_serializer()),
+                status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+            return response
+        article = Article.objects.for_listing(request.user).filter(
+            slug=slug).first()
         if article:
             serializer = self.serializer_class(
                 article, context={'request': request})
-            return Response(serializer.data, status.HTTP_200_OK)
+            article_cache.set_article(article, serializer.data)
+            response = Response(serializer.data, status.HTTP_200_OK)
+            response['X-Cache'] = 'MISS'
+            return response
         else:
             # return error message indicating article requested is not found.
             return Response({
@@ -251,23 +327,22 @@ class FavoriteArticle(generics.CreateAPIView):
             return Response(response, status=status.HTTP_404_NOT_FOUND)
         user = request.user
 
-        if user in article.favourited.all():
-            # User has already favourited it, unfavourites the article
-            article.favourited.remove(user.id)
-            article.save()
-            serializer = self.get_serializer(article)
-            message = "You have successfully unfavourited this article"
-            response = {"message": message, "article": serializer.data}
-            return Response(response, status=status.HTTP_200_OK)
-
-        else:
-            # Favourites the article
-            article.favourited.add(user.id)
-            article.save()
-            serializer = self.get_serializer(article)
-            message = "You have successfully favourited this article"
-            response = {"message": message, "article": serializer.data}
-            return Response(response, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            # lock the article so concurrent toggles keep the counter in step
+            article = Article.objects.select_for_update().get(pk=article.pk)
+            if article.favourited.filter(pk=user.pk).exists():
+                # User has already favourited it, unfavourites the article
+                article.favourited.remove(user.id)
+                article.update_counters(favourites_count=-1)
+                message = "You have successfully unfavourited this article"
+            else:
+                # Favourites the article
+                article.favourited.add(user.id)
+                article.update_counters(favourites_count=1)
+                message = "You have successfully favourited this article"
+        serializer = self.get_serializer(article)
+        response = {"message": message, "article": serializer.data}
+        return Response(response, status=status.HTTP_200_OK)
 
 
 class ArticleRatingAPIView(generics.ListCreateAPIView):
@@ -318,12 +393,6 @@ class ArticleRatingAPIView(generics.ListCreateAPIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        # Save the average article rating to the Article model
-        q = ArticleRating.objects.filter(article_id=article.id).aggregate(
-            Avg('rating'))
-        article.rating_average = q['rating__avg']
-        article.save(update_fields=['rating_average'])
-
         data = {"message": "Thank you for taking time to rate this article."}
 
         data = {
@@ -372,17 +441,9 @@ class ArticleLikes(generics.ListCreateAPIView):
                  },
                 status.HTTP_400_BAD_REQUEST)
         # we continue now since we are sure we have a valid payload
-        # Check whether user has already like or dislike this article
-        likes = None
         # Let's check whether the article requested exists in our
         # database and retrieve it
         article = self.get_object(slug)
-        try:
-            likes = Likes.objects.get(user=request.user.id, article=article)
-        except ObjectDoesNotExist:
-            # let's do nothing here since we are only checking whether user has
-            # liked or disliked this article
-            pass
         # Alert user if article does not exist
         if not article:
             return Response(
@@ -395,52 +456,52 @@ class ArticleLikes(generics.ListCreateAPIView):
             'user': request.user.id,
             'like': like
         }
-        # If there is a record for this article and the current user in the
-        # system, we modify it instead of creating a new one.
-        if likes:
-            # user had liked the article but now wants to dislike it
-            if likes.like and not like:
-                article.userLikes.remove(request.user)
-                article.userDisLikes.add(request.user)
-            # user had disliked this article but now wants to like it
-            elif not likes.like and like:
-                article.userLikes.add(request.user)
-                article.userDisLikes.remove(request.user)
-            elif like:
-                # User can only like an article once or dislike an article once
-                msg = '{}, you already liked this article.'.format(
-                    request.user.username)
-                return Response(
-                    {
-                        'message': msg
-                    }, status.HTTP_403_FORBIDDEN
-                )
-            else:
-                msg = '{}, you already disliked this article.'.format(
-                    request.user.username)
-                return Response(
-                    {
-                        'message': msg
-                    }, status.HTTP_403_FORBIDDEN
-                )
-            # save the new value/state of the article
-            article.save()
-            # There is no need to create a new record; edit the existing one
-            likes.like = like
-            likes.save()
-        else:
-            # We don't need to do any more operations here
-            # because this is user's first time to see this article
-            serializer = self.serializer_class(data=new_like)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            # update likes count or dislikes count for the article
-            if like:
-                article.userLikes.add(request.user)
+        with transaction.atomic():
+            # lock the article so concurrent likes and dislikes by the user
+            # see each other's records and keep the counters in step
+            article = Article.objects.select_for_update().get(pk=article.pk)
+            # Check whether user has already like or dislike this article
+            likes = Likes.objects.filter(
+                user=request.user.id, article=article).first()
+            # If there is a record for this article and the current user in
+            # the system, we modify it instead of creating a new one.
+            if likes:
+                if likes.like == like:
+                    # User can only like an article once or dislike an
+                    # article once
+                    msg = '{}, you already {} this article.'.format(
+                        request.user.username, 'liked' if like else 'disliked')
+                    return Response(
+                        {
+                            'message': msg
+                        }, status.HTTP_403_FORBIDDEN
+                    )
+                if like:
+                    # user had disliked this article but now wants to like it
+                    article.userLikes.add(request.user)
+                    article.userDisLikes.remove(request.user)
+                    article.update_counters(likes_count=1, dislikes_count=-1)
+                else:
+                    # user had liked the article but now wants to dislike it
+                    article.userLikes.remove(request.user)
+                    article.userDisLikes.add(request.user)
+                    article.update_counters(likes_count=-1, dislikes_count=1)
+                # There is no need to create a new record; edit the existing one
+                likes.like = like
+                likes.save(update_fields=['like'])
             else:
-                article.userDisLikes.add(request.user)
-            # save the new state of our article
-            article.save()
+                # We don't need to do any more operations here
+                # because this is user's first time to see this article
+                serializer = self.serializer_class(data=new_like)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+                # update likes count or dislikes count for the article
+                if like:
+                    article.userLikes.add(request.user)
+                    article.update_counters(likes_count=1)
+                else:
+                    article.userDisLikes.add(request.user)
+                    article.update_counters(dislikes_count=1)
         # Tell user we are successful
         return Response(
             {
@@ -661,8 +722,8 @@ class ListCreateCommentAPIView(generics.ListCreateAPIView):
     Get and Post Comments
     """
     permission_classes = (IsAuthenticated, )
-    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
 
     def create(self, request, *args, **kwargs):
         """
@@ -680,13 +741,10 @@ class ListCreateCommentAPIView(generics.ListCreateAPIView):
         serializer.save(article=article)
         return Response(serializer.data)
 
-    def get(self, request, slug, *args, **kwargs):
-        """Get all comments for a particular article"""
-        article = Article.objects.get(slug=slug)
-        comments = Comment.objects.filter(article=article)
-        serializer = self.serializer_class(data=comments, many=True)
-        serializer.is_valid()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        """Get the comments of a particular article"""
+        return Comment.objects.filter(
+            article__slug=self.kwargs['slug']).select_related('commented_by')
 
 
 class RetrieveCommentAPIView(generics.RetrieveDestroyAPIView,
@@ -756,20 +814,65 @@ class RetrieveCommentsofAPIView(generics.ListAPIView):
     """
 
     permission_classes = (IsAuthenticated, )
-    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = CommentCursorPagination
 
-    def list(self, request, pk, slug):
-        """Method for listing all comments of a comment."""
-        try:
-            comment = self.queryset.get(pk=pk)
-        except Comment.DoesNotExist:
+    def get_queryset(self):
+        """Get the replies to the comment."""
+        if not Comment.objects.filter(pk=self.kwargs['pk']).exists():
             raise ValidationError("The comment does not exist")
-        comments = Comment.objects.filter(parent=comment)
-        serializer = self.serializer_class(data=comments, many=True)
-        serializer.is_valid()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Comment.objects.filter(
+            parent=self.kwargs['pk']).select_related('commented_by')
+
+
+class CommentThreadsAPIView(generics.ListAPIView):
+    """
+    get:
+    Retrieve the threads of comments of an article, nesting the replies of
+    every comment under it down to `?depth=` levels (3 by default), with
+    the first `?replies=` replies (5 by default) of each comment. Threads
+    are paginated with `?page=` and `?page_size=`. The threads under a
+    comment, to see deeper or further replies, are retrieved with
+    `?parent=<comment id>`.
+    """
+    permission_classes = (IsAuthenticated, )
+    serializer_class = CommentThreadSerializer
+    pagination_class = CommentThreadPagination
+    max_depth = 10
+    max_replies = 100
+
+    def get_queryset(self):
+        parent = self.request.query_params.get('parent') or None
+        if parent is not None and not parent.isdigit():
+            raise ValidationError('parent must be the id of a comment')
+        return Comment.objects.filter(
+            article__slug=self.kwargs['slug'], parent=parent).order_by('pk')
+
+    def get_limit(self, name, default, maximum):
+        value = self.request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if not 0 <= value <= maximum:
+            raise ValidationError(
+                '{} must be a number from 0 to {}'.format(name, maximum))
+        return value
+
+    def list(self, request, slug):
+        depth = self.get_limit('depth', 3, self.max_depth)
+        replies_per_comment = self.get_limit('replies', 5, self.max_replies)
+        comments = self.paginate_queryset(self.get_queryset())
+        replies = []
+        if depth and replies_per_comment:
+            replies = load_replies(comments, depth, replies_per_comment)
+        serializer = self.get_serializer
+        return self.get_paginated_response(nest_replies(
+            serializer(comments, many=True).data,
+            serializer(replies, many=True).data,
+            replies_per_comment))
+
 
 class ArticleBookmarkAPIView(generics.CreateAPIView):
     """
@@ -813,28 +916,29 @@ class ArticleBookmarkAPIView(generics.CreateAPIView):
             )
 
 
-class ArticleBookmarkDetailAPIView(generics.RetrieveDestroyAPIView):
+class ArticleBookmarkDetailAPIView(mixins.ListModelMixin,
+                                   generics.RetrieveDestroyAPIView):
     """
     get:
-    Retrieve a singe or all bookmarks for a logged in user
+    Retrieve a singe or all bookmarks for a logged in user, with a summary
+    of the bookmarked articles. All bookmarks are paginated, latest first,
+    with `?page_size=` for up to 100 bookmarks a page.
     delete:
     Delete a single or all bookmarks
     """
     permission_classes = (IsAuthenticated, )
-    serializer_class = BookmarkSerializer
-    queryset = Bookmark.objects.all()
+    serializer_class = BookmarkListSerializer
+    pagination_class = BookmarkCursorPagination
+
+    def get_queryset(self):
+        # the summaries show the authors of the articles
+        return Bookmark.objects.filter(
+            user=self.request.user).select_related('article__author')
 
     def get(self, request, pk=None):
         if pk:
-            bookmarks = Bookmark.objects.filter(user=request.user)
-            serializer = self.serializer_class(data=bookmarks, many=True)
-            serializer.is_valid()
-            return Response(serializer.data)
-        else:
-            bookmarks = Bookmark.objects.filter(user=request.user)
-            serializer = self.serializer_class(data=bookmarks, many=True)
-            serializer.is_valid()
-            return Response(serializer.data)
+            return self.retrieve(request, pk=pk)
+        return self.list(request)
 
     def delete(self, request, pk=None):
         try:
@@ -861,3 +965,129 @@ class ArticleBookmarkDetailAPIView(generics.RetrieveDestroyAPIView):
                 + 'the bookmark you want to delete does not exist'
             }, status.HTTP_404_NOT_FOUND
             )
+
+
+class ArticleCacheStatsAPIView(APIView):
+    """
+    get:
+    Return how often the article cache was hit and missed, for monitoring.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(article_cache.stats(), status.HTTP_200_OK)
+
+
+class ArticleExportAPIView(APIView):
+    """
+    get:
+    Stream every article as newline delimited JSON in a single response,
+    or only those updated since `?updated_since=<ISO 8601 datetime>` for an
+    incremental sync. An incremental sync ends with a line for every article
+    deleted since, holding its `slug`, `deleted` and `deleted_at`. An
+    article is exported again after any change to what it looks like,
+    including its counters and tags. The body is gzip compressed if the
+    client accepts it.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        queryset = Article.objects.for_listing(request.user)
+        chunk_size = settings.ARTICLE_EXPORT_CHUNK_SIZE
+        deletions = ()
+        updated_since = request.query_params.get('updated_since')
+        if updated_since:
+            try:
+                since = parse_datetime(updated_since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({
+                    'errors': 'updated_since must be an ISO 8601 datetime'
+                }, status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            queryset = queryset.filter(changed_at__gte=since)
+            deletions = export_deletions(since, chunk_size)
+        response = StreamingHttpResponse(
+            chain(export_articles(queryset, chunk_size, {'request': request}),
+                  deletions),
+            content_type='application/x-ndjson')
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            response.streaming_content = compress_sequence(
+                response.streaming_content)
+            response['Content-Encoding'] = 'gzip'
+        return response
+
+
+class FeedAPIView(generics.ListAPIView):
+    """
+    get:
+    Retrieve the articles of the authors the user follows, latest first,
+    paginated with a cursor in the `next` link.
+    """
+    serializer_class = ArticleSerializer
+    renderer_classes = (ArticleJSONRenderer,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        return Article.objects.for_listing(self.request.user)
+
+    def list(self, request):
+        paginator = self.paginator
+        positions = feed_page(
+            request.user, paginator.get_page_size(request),
+            paginator.get_position(request))
+        ids = paginator.paginate_positions(positions, request)
+        articles = self.get_queryset().in_bulk(ids)
+        # articles deleted since the page was read are left out
+        page = [articles[pk] for pk in ids if pk in articles]
+        return paginator.get_paginated_response(
+            self.get_serializer(page, many=True).data)
+
+
+class TrendingAPIView(generics.ListAPIView):
+    """
+    get:
+    Retrieve the articles with the most recent engagement, most trending
+    first, as ranked by `TrendingArticlesCron`.
+    """
+    serializer_class = ArticleSerializer
+    renderer_classes = (ArticleJSONRenderer,)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = TrendingPagination
+
+    def get_queryset(self):
+        return Article.objects.for_listing(self.request.user)
+
+    def list(self, request):
+        ids = self.paginate_queryset(trending_ids())
+        articles = self.get_queryset().in_bulk(ids)
+        # articles deleted since the ranking was cached are left out
+        page = [articles[pk] for pk in ids if pk in articles]
+        return self.get_paginated_response(
+            self.get_serializer(page, many=True).data)
+
+
+class TagListAPIView(generics.ListAPIView):
+    """
+    get:
+    List the tags in use with the number of articles they are on, most
+    used first, or most trending first with `?ordering=trending`. Pass
+    `?page_size=` for up to 100 tags a page.
+    """
+    serializer_class = TagsSerializer
+    renderer_classes = (TagJSONRenderer,)
+    permission_classes = (AllowAny,)
+    pagination_class = TagPagination
+
+    def get_queryset(self):
+        # the counts are materialized on the tags, see `tags.py`
+        if self.request.query_params.get('ordering') == 'trending':
+            ordering = ('-trending_score', '-article_count', 'tag')
+        else:
+            ordering = ('-article_count', 'tag')
+        return ArticleTags.objects.filter(
+            article_count__gt=0).order_by(*ordering)
@@ -6,6 +6,7 @@ from django.conf import settings
 from rest_framework import authentication, exceptions
 
 from .models import User
+from .user_cache import user_cache
 
 
 def generate_jwt_token(username):
@@ -39,10 +40,17 @@ class JWTAuthentication(authentication.TokenAuthentication):
         :return: Tuple of the user object and non-user authentication
         information
         """
+        user = user_cache.get(token)
+        if user is not None:
+            return user, None
+        generation = user_cache.generation
         try:
             payload = jwt.decode(token, settings.SECRET_KEY)
             try:
-                user = User.objects.get(username=payload['username'])
+                # most views go on to use the profile so load it as well
+                user = User.objects.select_related('profile').get(
+                    username=payload['username'])
+                user_cache.set(token, user, payload['exp'], generation)
                 return user, None
             except User.DoesNotExist:
                 return None, None
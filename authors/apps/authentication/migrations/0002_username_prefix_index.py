@@ -0,0 +1,33 @@
+# Generated by Django 2.1 on 2026-10-18 10:55
+
+from django.db import migrations
+
+
+def create_username_prefix_index(apps, schema_editor):
+    """
+    Index usernames for the case insensitive prefix search of profiles,
+    `UPPER(username::text) LIKE UPPER('prefix%')` on PostgreSQL. Other
+    databases use the unique index on usernames.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX authentication_user_username_upper_like '
+            'ON authentication_user (UPPER(username::text) text_pattern_ops)')
+
+
+def drop_username_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS authentication_user_username_upper_like')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_username_prefix_index, drop_username_prefix_index),
+    ]
@@ -1,4 +1,7 @@
 """ module to test registration. """
+from smtplib import SMTPException
+from unittest import mock
+
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -33,6 +36,17 @@ class AuthenticationTests(APITestCase):
         self.assertEqual(response.data['message'],
                          self.succesfull_register_message)
 
+    @mock.patch('authors.apps.core.tasks.send_mail',
+                side_effect=SMTPException('Connection refused'))
+    def test_unsuccessful_activation_email(self, send_mail):
+        """ Test that a user whose activation email fails is not registered """
+        response = self.client.post(
+            self.registration_url, self.valid_user, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Email activation failed')
+        self.assertFalse(
+            User.objects.filter(username=self.valid_user['username']).exists())
+
     def test_unsuccessful_register_existing_user(self):
         """ Test that one cannot register twice with same credentials """
         self.client.post(self.registration_url, self.valid_user, format='json')
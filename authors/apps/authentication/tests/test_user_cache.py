@@ -0,0 +1,70 @@
+""" module to test caching the users of authentication tokens. """
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from authors.apps.authentication.backends import generate_jwt_token
+from authors.apps.authentication.models import User
+from authors.apps.authentication.user_cache import user_cache
+
+
+class UserCacheTests(APITestCase):
+    def setUp(self):
+        """ Setup data for the tests """
+        user_cache.clear()
+        self.user = User.objects.create_user('user1', 'user1@user.user')
+        self.headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(
+            generate_jwt_token(self.user.username))}
+        self.user_url = reverse('authentication:current_user')
+
+    def test_cached_user_needs_no_queries(self):
+        """ Test that a repeated token is authenticated without queries """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.user_url, **self.headers)
+        self.assertEqual(len(queries), 1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.user_url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(user_cache.stats()['hits'], 1)
+
+    def test_saving_a_profile_invalidates_the_user(self):
+        """ Test that a changed profile is seen by the next request """
+        self.client.get(self.user_url, **self.headers)
+        self.client.put(self.user_url, {'user': {'bio': 'A new bio'}},
+                        format='json', **self.headers)
+        response = self.client.get(self.user_url, **self.headers)
+        self.assertEqual(response.data['profile']['bio'], 'A new bio')
+
+    @override_settings(AUTH_CACHE_SIZE=1)
+    def test_least_recently_used_token_is_evicted(self):
+        """ Test that the cache holds no more tokens than allowed """
+        other = User.objects.create_user('user2', 'user2@user.user')
+        self.client.get(self.user_url, **self.headers)
+        self.client.get(self.user_url, HTTP_AUTHORIZATION='Bearer {}'.format(
+            generate_jwt_token(other.username)))
+        stats = user_cache.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['evictions'], 1)
+
+    @override_settings(AUTH_CACHE_TTL=0)
+    def test_expired_user_is_loaded_again(self):
+        """ Test that users are not served past the time to live """
+        self.client.get(self.user_url, **self.headers)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.user_url, **self.headers)
+        self.assertEqual(len(queries), 1)
+
+    def test_admin_can_view_cache_stats(self):
+        """ Test that only admins can view the cache counters """
+        stats_url = reverse('authentication:auth_cache_stats')
+        response = self.client.get(stats_url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(stats_url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['size'], 1)
@@ -2,7 +2,8 @@ from django.urls import path
 
 from .views import (
     LoginAPIView, RegistrationAPIView, UserRetrieveUpdateAPIView, 
-    ForgotPasswordAPIView, ResetPasswordAPIView, UserActivationAPIView, SocialLoginView
+    ForgotPasswordAPIView, ResetPasswordAPIView, UserActivationAPIView, SocialLoginView,
+    AuthCacheStatsAPIView
 )
 
 app_name = 'authentication'
@@ -12,6 +13,8 @@ urlpatterns = [
          name='current_user'),
     path('users/signup/', RegistrationAPIView.as_view(), name='register'),
     path('users/login/', LoginAPIView.as_view(), name='login'),
+    path('users/auth-cache/stats/', AuthCacheStatsAPIView.as_view(),
+         name='auth_cache_stats'),
     path('accounts/forgot_password/', ForgotPasswordAPIView.as_view(), name='forgot'),
     path('reset_password/<str:token>/', ResetPasswordAPIView.as_view(), name='reset_password'),
     path('auth/<str:token>', UserActivationAPIView.as_view(), name='activate_user'),
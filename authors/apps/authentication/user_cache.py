@@ -0,0 +1,130 @@
+"""
+In-process cache of the users that JSON web tokens authenticate.
+
+Every authenticated request decodes its token and loads the user, and most
+go on to load the user's profile as well. Tokens are cached here together
+with their user, profile included, so repeated requests with the same token
+need no queries at all. The cache holds at most `AUTH_CACHE_SIZE` tokens,
+evicting the least recently used, and a token is dropped `AUTH_CACHE_TTL`
+seconds after it was cached or when it expires, whichever comes first.
+
+Saving or deleting a user or profile, or changing whom a profile follows,
+drops the tokens of the users involved from the cache of the current
+process; other processes pick the change up once their entries expire.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from authors.apps.profiles.models import Profile
+from .models import User
+
+
+class UserCache:
+    """
+    A bounded least recently used cache of token to user.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # bumped by every invalidation so that a user loaded before one is
+        # not cached after it
+        self.generation = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, token):
+        """
+        Return a copy of the user cached for the token, or None.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+        # requests must not share the instance, they may change it
+        return copy.deepcopy(entry[0])
+
+    def set(self, token, user, expires, generation):
+        """
+        Cache the user of a token which expires at the `expires` timestamp,
+        unless the cache was invalidated since `generation` was read.
+        """
+        if not settings.AUTH_CACHE_SIZE:
+            return
+        expires = min(expires, time.time() + settings.AUTH_CACHE_TTL)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[token] = (copy.deepcopy(user), expires)
+            self._entries.move_to_end(token)
+            while len(self._entries) > settings.AUTH_CACHE_SIZE:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, pk, username=None):
+        """
+        Drop the tokens of a user, matched by id or by username.
+        """
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            stale = [
+                token for token, (cached, _) in self._entries.items()
+                if cached.pk == pk or cached.username == username
+            ]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        """Empty the cache and reset its counters."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """Return the size and counters of the cache."""
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+user_cache = UserCache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk, instance.username)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def invalidate_follows(sender, instance, action, pk_set, **kwargs):
+    # the follow counts of both sides change without saving the profiles
+    if action.startswith('post_'):
+        user_cache.invalidate(instance.user_id)
+    if action in ('post_add', 'post_remove'):
+        for user_id in Profile.objects.filter(pk__in=pk_set).values_list(
+                'user_id', flat=True):
+            user_cache.invalidate(user_id)
@@ -4,14 +4,14 @@ from requests.exceptions import HTTPError
 
 from rest_framework import status, generics
 from rest_framework.generics import RetrieveUpdateAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
+from django.db import transaction
 from django.contrib.sites.shortcuts import get_current_site
-from django.core.mail import send_mail
 from django.shortcuts import redirect
 
 from .renderers import UserJSONRenderer
@@ -21,6 +21,7 @@ from .serializers import (
 )
 
 from .backends import generate_jwt_token
+from .user_cache import user_cache
 from .models import User
 from authors.apps.core.mailer import SendMail
 
@@ -72,16 +73,19 @@ class RegistrationAPIView(generics.CreateAPIView):
 
         activation_link = protocol + '://' + domain + '/api/auth/' + token
 
-        try:
-            send_mail(
-                subject,
-                message + activation_link,
-                settings.EMAIL_HOST_USER, [user['email']],
-                fail_silently=False)
-        except:
-            return Response(data={"message": "Email activation failed"})
-
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            try:
+                # queue the activation email so that it is sent outside of
+                # the request, or send it now when tasks run eagerly
+                SendMail(subject=subject,
+                         message=message + activation_link,
+                         email_from=settings.EMAIL_HOST_USER,
+                         to=user['email']).send()
+            except Exception:
+                # the user is not registered if the email cannot be sent
+                transaction.set_rollback(True)
+                return Response(data={"message": "Email activation failed"})
         data = {
             "message":
                 "Kindly click the link sent to your email to complete registration."
@@ -183,6 +187,18 @@ class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class AuthCacheStatsAPIView(APIView):
+    """
+    get:
+    Get the size and hit, miss, eviction and invalidation counters of the
+    authentication cache of the process serving the request.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(user_cache.stats(), status=status.HTTP_200_OK)
+
+
 class ForgotPasswordAPIView(APIView):
     """Forget password view captures email and generates token that will be.
     used during reset password. Data that is captures in the view is send to
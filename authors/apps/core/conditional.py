@@ -0,0 +1,47 @@
+"""
+Conditional GET support for the API views.
+"""
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag out of the values which identify a representation.
+    """
+    value = ':'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+
+def conditional_get(method):
+    """
+    Decorate the `get` method of a view so that clients which already hold
+    the current representation get an empty 304 Not Modified response.
+
+    The view must define `get_validators(request, *args, **kwargs)` returning
+    the ETag and the last modified datetime of the representation, either of
+    which may be None. It is called before anything is serialized, so it
+    should cost no more than a single indexed lookup.
+    """
+    @wraps(method)
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        if last_modified is not None:
+            last_modified = timegm(last_modified.utctimetuple())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        if etag is not None:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+    return get
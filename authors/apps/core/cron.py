@@ -1,10 +1,16 @@
+import time
+
 from django_cron import CronJobBase, Schedule
 from django.utils.timesince import timesince
 from django.conf import settings
+from django.db.models import Prefetch
 from django.template.loader import render_to_string
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
 
-from authors.apps.notifications.models import Notification
+from authors.apps.articles.models import ArticleTags
+from authors.apps.articles.trending import update_scores
+from authors.apps.notifications.models import Notification, UserNotification
+from authors.apps.profiles.suggestions import rebuild_suggestions
 
 
 class EmailNotificationCron(CronJobBase):
@@ -15,25 +21,115 @@ class EmailNotificationCron(CronJobBase):
     code = 'authors.apps.core.cron.MyCronJob'  # a unique code
 
     def do(self):
-        """Send emails to all the persons to be notified."""
+        """
+        Send emails to all the persons to be notified.
+        Unsent notifications are processed in batches of `EMAIL_BATCH_SIZE`
+        over a single SMTP connection and marked as sent in bulk.
+        :returns str: throughput of the run which django_cron logs
+        """
+        started = time.time()
+        batch_size = settings.EMAIL_BATCH_SIZE
+        # only users who have not read the notification and want emails
+        recipients = UserNotification.objects.filter(
+            read=False,
+            user__profile__email_notification_enabled=True).select_related(
+                'user')
+        unsent = Notification.objects.filter(email_sent=False).order_by(
+            'pk').prefetch_related(
+                Prefetch('recipients', queryset=recipients,
+                         to_attr='email_recipients'))
+
+        batch_sizes = []
+        sent = 0
+        last_pk = 0
+        with get_connection(fail_silently=False) as connection:
+            while True:
+                batch = list(unsent.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                messages = [
+                    message for notification in batch
+                    if notification.email_recipients
+                    for message in self.build_messages(notification)
+                ]
+                if messages:
+                    sent += connection.send_messages(messages) or 0
+                Notification.objects.filter(
+                    pk__in=[notification.pk for notification in batch]).update(
+                        email_sent=True)
+                batch_sizes.append(len(batch))
+                last_pk = batch[-1].pk
+
+        elapsed = time.time() - started
+        return ('Sent {} emails for {} notifications in {} batches {} '
+                'in {:.2f}s ({:.1f} emails/s)').format(
+                    sent, sum(batch_sizes), len(batch_sizes), batch_sizes,
+                    elapsed, sent / elapsed if elapsed else 0)
+
+    def build_messages(self, notification):
+        """
+        Build an email of a notification for each of its recipients, so
+        that they do not see each other's addresses.
+        """
         subject = 'Authors Haven Notification'
+        content = {'notification': notification}
+        message = render_to_string("notification.html", content)
+        mails = []
+        for recipient in notification.email_recipients:
+            mail = EmailMessage(
+                subject=subject,
+                body=message,
+                to=[recipient.user.email],
+                from_email=settings.EMAIL_HOST_USER)
+            mail.content_subtype = "html"
+            mails.append(mail)
+        return mails
+
+
+class TagCountsCron(CronJobBase):
+    """
+    Rebuild the article counts and trending scores of all tags. The counts
+    are kept current as articles are tagged, this reconciles them and lets
+    the trending scores decay over time.
+    """
+
+    schedule = Schedule(run_every_mins=settings.TAG_COUNTS_EVERY_MINS)
+    code = 'authors.apps.core.cron.TagCountsCron'
+
+    def do(self):
+        started = time.time()
+        updated = ArticleTags.objects.rebuild_counts()
+        return 'Rebuilt the counts of {} tags in {:.2f}s'.format(
+            updated, time.time() - started)
 
-        recipients = []
-        notifications = Notification.objects.all()
-        for notification in notifications:
-            if notification.email_sent == False:
-                for user in notification.notified.all():
-                    if user not in notification.read.all():
-                        if user.profile.email_notification_enabled == True:
-                            recipients.append(user.email)
-                content = {'notification': notification}
-                message = render_to_string("notification.html", content)
-                mail = EmailMessage(
-                    subject=subject,
-                    body=message,
-                    to=recipients,
-                    from_email=settings.EMAIL_HOST_USER)
-                mail.content_subtype = "html"
-                mail.send(fail_silently=False)
-                notification.email_sent = True
-                notification.save()
+
+class FollowSuggestionsCron(CronJobBase):
+    """
+    Recompute the suggestions of authors to follow of every user from the
+    follow graph, the tags they read and the engagement of authors.
+    """
+
+    schedule = Schedule(run_every_mins=settings.FOLLOW_SUGGESTIONS_EVERY_MINS)
+    code = 'authors.apps.core.cron.FollowSuggestionsCron'
+
+    def do(self):
+        started = time.time()
+        stored = rebuild_suggestions()
+        return 'Stored {} suggestions to follow in {:.2f}s'.format(
+            stored, time.time() - started)
+
+
+class TrendingArticlesCron(CronJobBase):
+    """
+    Update the trending scores of articles with the engagement since the
+    last run, letting older engagement decay.
+    """
+
+    schedule = Schedule(run_every_mins=settings.TRENDING_EVERY_MINS)
+    code = 'authors.apps.core.cron.TrendingArticlesCron'
+
+    def do(self):
+        started = time.time()
+        counted, articles = update_scores()
+        return ('Counted {} engagements on {} articles into trending scores '
+                'in {:.2f}s').format(counted, articles, time.time() - started)
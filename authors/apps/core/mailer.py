@@ -1,6 +1,6 @@
 # Custom mail sender
 
-from django.core.mail import send_mail
+from .tasks import send_email
 
 
 class SendMail:
@@ -12,4 +12,6 @@ class SendMail:
         self.to = to
 
     def send(self):
-        send_mail(self.subject, self.message, self.receipt, [self.to])
+        # queue the email so that it is sent outside of the request
+        send_email.delay(subject=self.subject, message=self.message,
+                         from_email=self.receipt, recipient_list=[self.to])
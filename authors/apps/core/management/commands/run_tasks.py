@@ -0,0 +1,56 @@
+import time
+from multiprocessing import Process
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from authors.apps.core.tasks import claim_job, run_job
+
+
+class Command(BaseCommand):
+    """
+    Start workers which run the jobs queued in the background task queue.
+    """
+    help = 'Run queued background tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Number of worker processes to start.')
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Seconds to wait before polling an empty queue again.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling it.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers == 1:
+            self.work(options['sleep'], options['once'])
+            return
+        # every process has to open its own database connection
+        connections.close_all()
+        processes = [
+            Process(target=self.work, args=(options['sleep'], options['once']))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    def work(self, sleep, once):
+        """Run jobs until the queue is empty or forever if `once` is unset."""
+        while True:
+            job = claim_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(sleep)
+                continue
+            if run_job(job):
+                self.stdout.write('Ran {}'.format(job.task))
+            else:
+                self.stderr.write('Failed {} (attempt {} of {})'.format(
+                    job.task, job.attempts, job.max_attempts))
@@ -1,7 +1,45 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 class TimeStampModel(models.Model):
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
     updated_at = models.DateTimeField(_('updated at'), auto_now_add=False, auto_now=True)
 
+
+
+class Job(models.Model):
+    """
+    A unit of background work waiting in the database backed task queue.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    )
+
+    class Meta:
+        # Workers pick the jobs that are due first
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    # dotted path to the task function, e.g. `authors.apps.core.tasks.send_email`
+    task = models.CharField(max_length=255)
+    # JSON encoded keyword arguments for the task
+    payload = models.TextField(default='{}')
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.task
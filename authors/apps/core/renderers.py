@@ -0,0 +1,118 @@
+"""
+Base renderer for the API responses, which are wrapped in an envelope such
+as `{"profile": {...}}`.
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+# Use a faster JSON encoder when one is installed. Both are optional; the
+# standard library encoder of the base renderer is used otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+NON_ASCII_BYTES = re.compile(b'[\x80-\xff]')
+NON_ASCII = re.compile('[^\x00-\x7f]')
+
+
+def _escape(match):
+    code = ord(match.group())
+    if code > 0xffff:
+        # characters outside the basic plane are escaped as surrogate pairs
+        code -= 0x10000
+        return '\\u{:04x}\\u{:04x}'.format(
+            0xd800 | code >> 10, 0xdc00 | code & 0x3ff)
+    return '\\u{:04x}'.format(code)
+
+
+def _ascii_json(dumped):
+    """
+    Escape the non ASCII characters of UTF-8 encoded JSON as the standard
+    library does. They can only be in strings, where an escape stands for
+    the same character.
+    """
+    if NON_ASCII_BYTES.search(dumped) is None:
+        return dumped
+    return NON_ASCII.sub(_escape, dumped.decode('utf-8')).encode('ascii')
+
+
+def _orjson_dumps(data, default):
+    # orjson always writes UTF-8 and has no option to escape it
+    return _ascii_json(orjson.dumps(data, default=default))
+
+
+def _ujson_dumps(data, default):
+    return ujson.dumps(
+        data, ensure_ascii=True, escape_forward_slashes=False).encode('ascii')
+
+
+if orjson is not None:
+    fast_dumps = _orjson_dumps
+elif ujson is not None:
+    fast_dumps = _ujson_dumps
+else:
+    fast_dumps = None
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    Renders data wrapped in an envelope named by `envelope`. Lists and pages
+    of objects are wrapped in `list_envelope` instead when it is set, and
+    the data of failed requests, which have an `errors` key, is rendered
+    without an envelope unless `envelope_errors` is set.
+
+    The body is encoded straight to bytes with the fast encoder if one is
+    installed and no indentation was asked for; anything it cannot encode
+    falls back to the standard library encoder. Non ASCII characters are
+    escaped whichever encoder is used, as these renderers always have.
+    """
+    charset = 'utf-8'
+    ensure_ascii = True
+    envelope = None
+    list_envelope = None
+    envelope_errors = False
+
+    def get_envelope(self, data):
+        """
+        Return the name of the envelope for the data. A single object is
+        the data serialized from one instance.
+        """
+        if self.list_envelope and not isinstance(data, ReturnDict):
+            return self.list_envelope
+        return self.envelope
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (not self.envelope_errors and isinstance(data, dict)
+                and data.get('errors', None)):
+            return self.render_errors(
+                data, accepted_media_type, renderer_context)
+        return self.dumps({self.get_envelope(data): data},
+                          accepted_media_type, renderer_context)
+
+    def render_errors(self, data, accepted_media_type=None,
+                      renderer_context=None):
+        """
+        Render the data of a failed request, as it is by default.
+        """
+        return self.dumps(data, accepted_media_type, renderer_context)
+
+    def dumps(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Encode the data to JSON bytes.
+        """
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if fast_dumps is not None and indent is None and self.compact:
+            try:
+                return fast_dumps(data, self.encoder_class().default)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Run the tests with background tasks run in process, so that their
+    effects can be checked straight after the request queueing them.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.TASKS_EAGER = True
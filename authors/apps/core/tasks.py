@@ -0,0 +1,124 @@
+"""
+A small database backed queue for running work outside of the request.
+
+Functions decorated with `task` can be queued with `.delay(**kwargs)`. The
+keyword arguments are stored as JSON in a `Job` row which a worker started
+with `python manage.py run_tasks` picks up, runs and retries with an
+exponential backoff when it fails. A claimed job is leased to its worker
+for `TASKS_LEASE_SECONDS`, after which it is claimed again, so the jobs
+of a worker which died are not lost. With `TASKS_EAGER` set the task runs
+in process straight away instead, which is what the tests rely on.
+"""
+import json
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+class Task:
+    """
+    Wraps a function so that it can be run now or queued for a worker.
+    """
+
+    def __init__(self, func, max_attempts=5):
+        self.func = func
+        self.max_attempts = max_attempts
+        self.path = '{}.{}'.format(func.__module__, func.__name__)
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def delay(self, **kwargs):
+        """
+        Queue the task to run with the given JSON serializable arguments.
+        :returns Job: the queued job or None if the task ran eagerly
+        """
+        if settings.TASKS_EAGER:
+            self.func(**kwargs)
+            return None
+        return Job.objects.create(
+            task=self.path, payload=json.dumps(kwargs),
+            max_attempts=self.max_attempts)
+
+
+def task(func=None, max_attempts=5):
+    """
+    Decorator registering a function as a background task.
+    """
+    if func is None:
+        return lambda func: Task(func, max_attempts=max_attempts)
+    return Task(func, max_attempts=max_attempts)
+
+
+def claim_job():
+    """
+    Take the next job that is due off the queue and mark it as running,
+    leased to the worker until `run_at`. Jobs still running when their lease
+    runs out are taken again, or failed if they are out of attempts. Rows
+    are locked while they are claimed so that concurrent workers never pick
+    the same job.
+    :returns Job: the claimed job or None if there is nothing to do
+    """
+    options = {}
+    if connection.features.has_select_for_update_skip_locked:
+        options['skip_locked'] = True
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            job = Job.objects.select_for_update(**options).filter(
+                status__in=(Job.PENDING, Job.RUNNING), run_at__lte=now).first()
+            if job is None:
+                return None
+            if job.status == Job.RUNNING and job.attempts >= job.max_attempts:
+                job.status = Job.FAILED
+                job.last_error = 'The lease of the last attempt ran out.'
+                job.save(update_fields=['status', 'last_error', 'updated_at'])
+                continue
+            job.status = Job.RUNNING
+            job.attempts += 1
+            job.run_at = now + timedelta(seconds=settings.TASKS_LEASE_SECONDS)
+            job.save(update_fields=[
+                'status', 'attempts', 'run_at', 'updated_at'])
+        return job
+
+
+def run_job(job):
+    """
+    Run a claimed job. Successful jobs are removed from the queue while
+    failed ones are retried later until they run out of attempts.
+    :returns bool: whether the job succeeded
+    """
+    try:
+        func = import_string(job.task)
+        func(**json.loads(job.payload))
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+        else:
+            # wait twice as long after every failed attempt
+            delay = settings.TASKS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+        job.save(update_fields=[
+            'status', 'run_at', 'last_error', 'updated_at'])
+        return False
+    job.delete()
+    return True
+
+
+@task
+def send_email(subject, message, from_email, recipient_list):
+    """
+    Send a plain text email.
+    """
+    send_mail(subject, message, from_email, recipient_list,
+              fail_silently=False)
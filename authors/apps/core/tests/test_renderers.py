@@ -0,0 +1,75 @@
+import json
+from collections import OrderedDict
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from authors.apps.articles.renderers import (
+    ArticleJSONRenderer, BookmarkJSONRenderer)
+from authors.apps.core import renderers
+from authors.apps.profiles.renderers import ProfileJSONRenderer
+
+
+class EnvelopeJSONRendererTests(SimpleTestCase):
+    """Test suite for the renderer wrapping responses in envelopes."""
+
+    def test_single_objects_and_lists_get_their_envelopes(self):
+        """
+        Tests that a serialized instance and a page of them are wrapped in
+        the single and list envelopes.
+        """
+        renderer = ArticleJSONRenderer()
+        single = ReturnDict({'slug': 'a'}, serializer=None)
+        page = OrderedDict([('count', 1), ('results', [{'slug': 'a'}])])
+        self.assertEqual(renderer.render(single),
+                         b'{"Article":{"slug":"a"}}')
+        self.assertEqual(json.loads(renderer.render(page).decode()),
+                         {'Articles': page})
+
+    def test_errors_are_rendered_without_an_envelope(self):
+        """
+        Tests that errors skip the envelope, and that bookmarks only render
+        the errors themselves.
+        """
+        errors = {'errors': {'detail': 'Not found.'}}
+        self.assertEqual(ProfileJSONRenderer().render(errors),
+                         b'{"errors":{"detail":"Not found."}}')
+        self.assertEqual(BookmarkJSONRenderer().render(errors),
+                         b'{"detail":"Not found."}')
+        self.assertEqual(ProfileJSONRenderer().render(ReturnList(
+            [{'username': 'a'}], serializer=None)),
+            b'{"profile":[{"username":"a"}]}')
+
+    def test_fast_encoder_is_used_when_installed(self):
+        """
+        Tests that an installed fast encoder renders the body, and that data
+        it cannot encode falls back to the standard library.
+        """
+        def fast_dumps(data, default):
+            if 'rating' in data['profile']:
+                raise TypeError('Unsupported type')
+            return b'fast'
+
+        renderer = ProfileJSONRenderer()
+        with mock.patch.object(renderers, 'fast_dumps', fast_dumps):
+            self.assertEqual(renderer.render({'username': 'a'}), b'fast')
+            self.assertEqual(
+                renderer.render({'rating': Decimal('4.5')}),
+                b'{"profile":{"rating":4.5}}')
+            # indented output is left to the standard library
+            self.assertIn(b'\n', renderer.render(
+                {'username': 'a'}, 'application/json; indent=2'))
+
+    def test_fast_encoder_output_is_escaped(self):
+        """
+        Tests that the UTF-8 written by orjson is escaped as the standard
+        library escapes it.
+        """
+        data = {'title': 'Café “quoted” 𝄞', 'url': 'a/b'}
+        dumped = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        self.assertEqual(
+            renderers._ascii_json(dumped.encode('utf-8')),
+            json.dumps(data, separators=(',', ':')).encode('ascii'))
+        self.assertEqual(renderers._ascii_json(b'{"a":"b"}'), b'{"a":"b"}')
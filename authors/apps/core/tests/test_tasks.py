@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from authors.apps.core.models import Job
+from authors.apps.core.tasks import claim_job, run_job, send_email, task
+
+calls = []
+
+
+@task(max_attempts=2)
+def flaky_task(fail):
+    """Task used to test the queue which fails when asked to."""
+    if fail:
+        raise ValueError('Failed on purpose')
+    calls.append(fail)
+
+
+@override_settings(TASKS_EAGER=False, TASKS_RETRY_DELAY=10)
+class TaskQueueTests(TestCase):
+    """Test suite for the background task queue."""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_queues_a_job(self):
+        """
+        Tests that delaying a task stores it for a worker instead of running it
+        """
+        job = flaky_task.delay(fail=False)
+        self.assertEqual(job.task, 'authors.apps.core.tests.test_tasks.flaky_task')
+        self.assertEqual(calls, [])
+
+    def test_successful_job_is_removed(self):
+        """
+        Tests that a job which runs successfully is removed from the queue
+        """
+        flaky_task.delay(fail=False)
+        self.assertTrue(run_job(claim_job()))
+        self.assertEqual(calls, [False])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_then_given_up(self):
+        """
+        Tests that a failing job is retried later until it runs out of attempts
+        """
+        flaky_task.delay(fail=True)
+        self.assertFalse(run_job(claim_job()))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIsNone(claim_job())
+
+        Job.objects.update(run_at=timezone.now())
+        self.assertFalse(run_job(claim_job()))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIn('Failed on purpose', job.last_error)
+
+    @override_settings(TASKS_LEASE_SECONDS=0)
+    def test_job_of_a_dead_worker_is_claimed_again(self):
+        """
+        Tests that a job still running when its lease runs out is claimed
+        again until it runs out of attempts
+        """
+        flaky_task.delay(fail=False)
+        self.assertEqual(claim_job().attempts, 1)
+        job = claim_job()
+        self.assertEqual((job.status, job.attempts), (Job.RUNNING, 2))
+        self.assertIsNone(claim_job())
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('lease', job.last_error)
+
+    def test_running_job_is_not_claimed_again(self):
+        """
+        Tests that a job is not claimed by another worker while it is leased
+        """
+        flaky_task.delay(fail=False)
+        claim_job()
+        self.assertIsNone(claim_job())
+
+    def test_worker_sends_queued_emails(self):
+        """
+        Tests that the worker command sends emails queued during a request
+        """
+        send_email.delay(subject='Hello', message='Hi there',
+                         from_email='from@ah.com', recipient_list=['to@ah.com'])
+        self.assertEqual(len(mail.outbox), 0)
+        call_command('run_tasks', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_task_in_process(self):
+        """
+        Tests that tasks run straight away in eager mode
+        """
+        self.assertIsNone(flaky_task.delay(fail=False))
+        self.assertEqual(calls, [False])
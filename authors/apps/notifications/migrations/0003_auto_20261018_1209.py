@@ -0,0 +1,73 @@
+# Generated by Django 2.1 on 2026-10-18 09:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_inboxes(apps, schema_editor):
+    """
+    Copy the recipients of existing notifications into their inboxes,
+    dated to when the notifications were made.
+    """
+    Notification = apps.get_model('notifications', 'Notification')
+    UserNotification = apps.get_model('notifications', 'UserNotification')
+    for notification in Notification.objects.all():
+        read = set(notification.read.values_list('pk', flat=True))
+        UserNotification.objects.bulk_create([
+            UserNotification(
+                notification=notification, user=user, read=user.pk in read)
+            for user in notification.notified.all()
+        ])
+        # `created_at` is set to now on insert, whatever it is given
+        UserNotification.objects.filter(notification=notification).update(
+            created_at=notification.created_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0002_notification_email_sent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['read', '-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='usernotification',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipients', to='notifications.Notification'),
+        ),
+        migrations.AddField(
+            model_name='usernotification',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', 'read', 'created_at'], name='notificatio_user_id_4cf22b_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='usernotification',
+            unique_together={('user', 'notification')},
+        ),
+        migrations.RunPython(fill_inboxes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='notification',
+            name='notified',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='read',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_auto_20261018_1209'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usernotification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
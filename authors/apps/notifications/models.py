@@ -1,4 +1,5 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.contenttypes.models import ContentType
 
 from authors.apps.authentication.models import User
@@ -17,9 +18,6 @@ class Notification(models.Model):
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     notification = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
-    notified = models.ManyToManyField(
-        User, related_name='notified', blank=True)
-    read = models.ManyToManyField(User, related_name='read', blank=True)
     classification = models.TextField(default="article")
     email_sent = models.BooleanField(default=False)
 
@@ -28,17 +26,55 @@ class Notification(models.Model):
         return self.notification
 
 
+class UserNotification(models.Model):
+    """
+    Defines the inbox entry of a notification for one of its recipients.
+    """
+
+    class Meta:
+        # A user receives a notification only once.
+        unique_together = (('user', 'notification'))
+        # Inboxes are read per user, unread first and newest first.
+        ordering = ['read', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'read', 'created_at']),
+        ]
+
+    user = models.ForeignKey(
+        User, related_name='inbox', on_delete=models.CASCADE)
+    notification = models.ForeignKey(
+        Notification, related_name='recipients', on_delete=models.CASCADE)
+    read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        "Returns a string representation of the inbox entry."
+        return self.notification.notification
+
+
 def notify_follower(author, notification, article):
     """
     Function that adds a notification to the Notification model.
-    in order to add them to the notified column of the notification.
+    in order to add it to the inbox of the author's followers.
+    Inbox entries are inserted in batches of `NOTIFICATION_BATCH_SIZE` so
+    that authors with many followers do not cost one query per follower.
     """
-    created_notification = Notification.objects.create(
-        notification=notification, classification="article", article=article)
-    followers = author.profile.followed_by.all()
-
-    for follower in followers:
-        # checks if notification is set to True
-        if follower.app_notification_enabled is True:
-            created_notification.notified.add(follower.user.id)
-    created_notification.save()
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    # only followers who have their notifications set to True
+    followers = author.profile.followed_by.filter(
+        app_notification_enabled=True).values_list('user_id', flat=True)
+
+    with transaction.atomic():
+        created_notification = Notification.objects.create(
+            notification=notification, classification="article",
+            article=article)
+        batch = []
+        for user_id in followers.iterator(chunk_size=batch_size):
+            batch.append(UserNotification(
+                user_id=user_id, notification=created_notification))
+            if len(batch) == batch_size:
+                UserNotification.objects.bulk_create(batch)
+                batch = []
+        UserNotification.objects.bulk_create(batch)
+    return created_notification
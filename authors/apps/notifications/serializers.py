@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Notification
+from .models import Notification, UserNotification
 
 from authors.apps.articles.serializers import ArticleSerializer
 from django.utils.timesince import timesince
@@ -32,7 +32,40 @@ class NotificationSerializer(serializers.ModelSerializer):
         Returns True or False to the serializer.
         """
         request = self.context.get('request')
-        if request.user in instance.read.all():
-            return False
-        else:
-            return True
+        return not instance.recipients.filter(
+            user=request.user, read=True).exists()
+
+
+class UserNotificationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for notifications in a user's inbox.
+    """
+    id = serializers.ReadOnlyField(source='notification_id')
+    notification = serializers.ReadOnlyField(
+        source='notification.notification')
+    classification = serializers.ReadOnlyField(
+        source='notification.classification')
+    article = ArticleSerializer(source='notification.article')
+    timestance = serializers.SerializerMethodField(
+        method_name='calculate_timesince')
+    unread = serializers.SerializerMethodField(method_name='is_unread')
+
+    class Meta:
+        """
+        Notification fields to be returned to users
+        """
+        model = UserNotification
+        fields = ('id', 'unread', 'created_at', 'notification',
+                  'classification', 'article', 'timestance')
+
+    def calculate_timesince(self, instance, now=None):
+        """
+        Get the time difference of the notification with the current time.
+        """
+        return timesince(instance.created_at, now)
+
+    def is_unread(self, instance):
+        """
+        Returns True if the user has not read the notification.
+        """
+        return not instance.read
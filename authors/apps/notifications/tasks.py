@@ -0,0 +1,19 @@
+from authors.apps.articles.models import Article
+from authors.apps.core.tasks import task
+
+from .models import notify_follower
+
+
+@task
+def notify_followers_of_article(article_id):
+    """
+    Notify the followers of an author about an article they have created.
+    """
+    article = Article.objects.select_related('author').filter(
+        pk=article_id).first()
+    if article is None:
+        # the article was deleted before its followers could be notified
+        return
+    message = (article.author.username +
+               " has created an article. Title: " + article.title)
+    notify_follower(article.author, message, article)
@@ -2,10 +2,16 @@ from .base_setup import Base
 from rest_framework import status
 from django.urls import reverse
 from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from authors.apps.authentication.models import User
 from authors.apps.profiles.models import Profile
 from authors.apps.core.cron import EmailNotificationCron
+from authors.apps.articles.models import Article
+from authors.apps.notifications.models import notify_follower
 
 
 class ArticleDeleteUpdateTests(Base):
@@ -40,7 +46,7 @@ class ArticleDeleteUpdateTests(Base):
         self.assertEqual(len(mail.outbox), 3)
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         response = self.client.get(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_two)
@@ -52,7 +58,7 @@ class ArticleDeleteUpdateTests(Base):
         """
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         delete = self.client.delete(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_two)
@@ -64,7 +70,7 @@ class ArticleDeleteUpdateTests(Base):
         """
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         delete = self.client.delete(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_one)
@@ -76,7 +82,7 @@ class ArticleDeleteUpdateTests(Base):
         """
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         delete = self.client.put(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_one)
@@ -88,7 +94,7 @@ class ArticleDeleteUpdateTests(Base):
         """
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         delete = self.client.put(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_two)
@@ -100,7 +106,7 @@ class ArticleDeleteUpdateTests(Base):
         """
         notification = self.client.get(
             reverse('notifications:my_notifications'), **self.headers_two)
-        pk = [*notification.data][0]
+        pk = notification.data['results'][0]['id']
         delete = self.client.put(
             reverse('notifications:notification', kwargs={'pk': pk}),
             **self.headers_one)
@@ -185,3 +191,114 @@ class ArticleDeleteUpdateTests(Base):
             reverse('notifications:switch_email_notifications'),
             **self.headers_one)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unread_notifications_are_counted_and_listed_first(self):
+        """
+        Tests that a user gets the number of unread notifications and sees
+        them before the ones they have read.
+        """
+        self.client.put(
+            reverse('notifications:my_notifications'), **self.headers_two)
+        self.client.post(
+            self.article_url,
+            self.article_data,
+            format="json",
+            **self.headers_one)
+        response = self.client.get(
+            reverse('notifications:unread_notifications'), **self.headers_two)
+        self.assertEqual(response.data['unread'], 1)
+        response = self.client.get(
+            reverse('notifications:my_notifications'), **self.headers_two)
+        self.assertEqual(
+            [item['unread'] for item in response.data['results']],
+            [True, False])
+
+    def test_unchanged_notifications_are_not_sent_again(self):
+        """
+        Tests that polling an unchanged inbox with its ETag returns an empty
+        304 response and that reading a notification or editing a notified
+        article changes the ETag.
+        """
+        url = reverse('notifications:my_notifications')
+        response = self.client.get(url, **self.headers_two)
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=etag, **self.headers_two)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        # the user is already authenticated so only the inbox is checked
+        self.assertEqual(len(queries), 1)
+        self.client.put(url, **self.headers_two)
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=etag, **self.headers_two)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        Article.objects.filter(slug=self.res.data['slug']).update(
+            title='Edited', changed_at=timezone.now())
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=etag, **self.headers_two)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0]['article']['title'], 'Edited')
+
+    @override_settings(NOTIFICATION_BATCH_SIZE=10)
+    def test_notify_followers_in_batches(self):
+        """
+        Tests that followers are notified with a query per batch of followers
+        rather than a query per follower.
+        """
+        author = User.objects.get(username=self.user_one_data['username'])
+        for index in range(25):
+            follower = User.objects.create_user(
+                'follower{}'.format(index), 'follower{}@gmail.com'.format(index))
+            follower.profile.app_notification_enabled = index != 0
+            follower.profile.save()
+            follower.profile.follow(author.profile)
+        article = Article.objects.get(slug=self.res.data['slug'])
+        with CaptureQueriesContext(connection) as queries:
+            notification = notify_follower(author, 'New article', article)
+        self.assertEqual(notification.recipients.count(), 25)
+        self.assertLess(len(queries), 10)
+
+    @override_settings(EMAIL_BATCH_SIZE=1)
+    def test_email_notifications_are_sent_once_in_batches(self):
+        """
+        Tests that unsent notifications are emailed in batches only to the
+        recipients who want them and are not emailed again.
+        """
+        self.client.post(
+            self.article_url,
+            self.article_data,
+            format="json",
+            **self.headers_one)
+        outbox = len(mail.outbox)
+        result = EmailNotificationCron().do()
+        self.assertEqual(len(mail.outbox), outbox + 2)
+        self.assertEqual(mail.outbox[-1].to, [self.user_two_data['email']])
+        self.assertIn('in 2 batches [1, 1]', result)
+        EmailNotificationCron().do()
+        self.assertEqual(len(mail.outbox), outbox + 2)
+
+    def test_each_recipient_is_emailed_alone(self):
+        """
+        Tests that the recipients of a notification are each sent their own
+        email, so that no one sees the addresses of the others.
+        """
+        author = User.objects.get(username=self.user_one_data['username'])
+        follower = User.objects.create_user('reader', 'reader@gmail.com')
+        follower.profile.follow(author.profile)
+        self.client.post(
+            self.article_url,
+            self.article_data,
+            format="json",
+            **self.headers_one)
+        outbox = len(mail.outbox)
+        EmailNotificationCron().do()
+        # the second user was also notified of the article of the setup
+        self.assertEqual(
+            sorted(message.to for message in mail.outbox[outbox:]),
+            [['reader@gmail.com'], [self.user_two_data['email']],
+             [self.user_two_data['email']]])
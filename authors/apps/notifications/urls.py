@@ -1,13 +1,18 @@
 from django.urls import path
 from .views import (NotificationDetailsView, NotificationAPIView,
                     NotificationSwitchAppAPIView,
-                    NotificationSwitchEmailAPIView)
+                    NotificationSwitchEmailAPIView,
+                    UnreadNotificationCountAPIView)
 
 app_name = 'notifications'
 
 urlpatterns = [
     path('<str:pk>', NotificationDetailsView.as_view(), name='notification'),
     path('', NotificationAPIView.as_view(), name='my_notifications'),
+    path(
+        'unread/',
+        UnreadNotificationCountAPIView.as_view(),
+        name='unread_notifications'),
     path(
         'switch_app/',
         NotificationSwitchAppAPIView.as_view(),
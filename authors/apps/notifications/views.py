@@ -4,11 +4,17 @@ This module defines views used in operations for notifications.
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.views import APIView
 from django.core.exceptions import ObjectDoesNotExist
-from .serializers import NotificationSerializer
+from django.db.models import Count, Max, Prefetch, Q
+from django.utils import timezone
+from .serializers import NotificationSerializer, UserNotificationSerializer
 from .renderers import NotificationJSONRenderer
-from .models import Notification
+from .models import Notification, UserNotification
+from authors.apps.articles.models import Article
 from authors.apps.profiles.models import Profile
+from authors.apps.core.conditional import conditional_get, make_etag
 
 
 class NotificationDetailsView(generics.RetrieveUpdateDestroyAPIView):
@@ -53,9 +59,9 @@ class NotificationDetailsView(generics.RetrieveUpdateDestroyAPIView):
 
         #check whether user has the notification before attempting to delete it
         user = request.user
-        if user in notification.notified.all():
-            notification.notified.remove(user.id)
-            notification.save()
+        deleted, _ = UserNotification.objects.filter(
+            user=user, notification=notification).delete()
+        if deleted:
             message = "You have successfully deleted this notification"
             response = {"message": message}
             return Response(response, status=status.HTTP_200_OK)
@@ -79,11 +85,11 @@ class NotificationDetailsView(generics.RetrieveUpdateDestroyAPIView):
                 'error': 'Notification with does not exist'
             }, status.HTTP_404_NOT_FOUND)
 
-        #check whether user is in the notified field
+        #check whether the notification is in the user's inbox
         user = request.user
-        if user in notification.notified.all():
-            notification.read.add(user.id)
-            notification.save()
+        if UserNotification.objects.filter(
+                user=user, notification=notification).update(
+                    read=True, updated_at=timezone.now()):
             message = "You have successfully marked the notification as read"
             response = {"message": message}
             return Response(response, status=status.HTTP_200_OK)
@@ -94,45 +100,74 @@ class NotificationDetailsView(generics.RetrieveUpdateDestroyAPIView):
             }, status.HTTP_403_FORBIDDEN)
 
 
-class NotificationAPIView(generics.RetrieveUpdateAPIView):
+class NotificationAPIView(generics.ListAPIView):
     """
     get:
+    Retrieve the notifications in the user's inbox, unread first.
+    put:
+    Mark all notifications as read.
     """
-    serializer_class = NotificationSerializer
+    serializer_class = UserNotificationSerializer
     renderer_classes = (NotificationJSONRenderer, )
     permission_classes = (IsAuthenticated, )
+    pagination_class = PageNumberPagination
 
-    def get(self, request):
+    def get_queryset(self):
         """
-        Retrieve all notifications from the database for a specific user.
-        :returns notifications: a json data for the notifications
+        Retrieve the inbox of the user together with the notified articles.
         """
-        user = request.user
-        notifications = Notification.objects.all()
-        data = {}
+        articles = Article.objects.for_listing(self.request.user)
+        return UserNotification.objects.filter(
+            user=self.request.user).select_related(
+                'notification').prefetch_related(
+                    Prefetch('notification__article', queryset=articles))
 
-        for notification in notifications:
-            if user in notification.notified.all():
-                serializer = self.serializer_class(
-                    notification, context={'request': request})
-                data[notification.id] = serializer.data
-        return Response(data, status=status.HTTP_200_OK)
+    def get_validators(self, request):
+        """
+        Derive the ETag of the page from a single aggregate over the inbox,
+        which changes whenever a notification arrives, is read or is deleted,
+        or one of the notified articles changes. There is no modification
+        time, as the latest one goes back when a notification is deleted.
+        """
+        inbox = UserNotification.objects.filter(user=request.user).aggregate(
+            count=Count('pk'), unread=Count('pk', filter=Q(read=False)),
+            latest=Max('pk'), modified=Max('updated_at'),
+            edited=Max('notification__article__changed_at'))
+        etag = make_etag(request.user.pk, request.get_full_path(),
+                         inbox['count'], inbox['unread'], inbox['latest'],
+                         inbox['modified'], inbox['edited'])
+        return etag, None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def put(self, request):
         """
         Mark all notifications as read.
         """
-        notifications = Notification.objects.all()
-        user = request.user
-        for notification in notifications:
-            if user in notification.notified.all():
-                notification.read.add(user.id)
-                notification.save()
-                message = "You successfully marked all notifications as read"
-                response = {"message": message}
+        UserNotification.objects.filter(
+            user=request.user, read=False).update(
+                read=True, updated_at=timezone.now())
+        message = "You successfully marked all notifications as read"
+        response = {"message": message}
         return Response(response, status=status.HTTP_200_OK)
 
 
+class UnreadNotificationCountAPIView(APIView):
+    """
+    get:
+    Retrieve the number of unread notifications in the user's inbox.
+    """
+    renderer_classes = (NotificationJSONRenderer, )
+    permission_classes = (IsAuthenticated, )
+
+    def get(self, request):
+        unread = UserNotification.objects.filter(
+            user=request.user, read=False).count()
+        return Response({"unread": unread}, status=status.HTTP_200_OK)
+
+
 class NotificationSwitchAppAPIView(generics.CreateAPIView):
     """
     A user is able to activate or deactivate notifications.
@@ -0,0 +1,39 @@
+# Generated by Django 2.1 on 2026-10-18 10:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_follows(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = Profile.follows.through
+
+    def follows(side):
+        rows = Follow.objects.filter(**{side: OuterRef('pk')}).order_by(
+        ).values(side).annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(rows, output_field=models.IntegerField()), 0)
+
+    Profile.objects.update(followers_count=follows('to_profile'),
+                           following_count=follows('from_profile'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_profile_email_notification_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
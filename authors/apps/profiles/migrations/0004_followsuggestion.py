@@ -0,0 +1,29 @@
+# Generated by Django 2.1 on 2026-10-18 10:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_follow_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowSuggestion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('mutual_count', models.PositiveIntegerField(default=0)),
+                ('shared_tag_count', models.PositiveIntegerField(default=0)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suggestions', to='profiles.Profile')),
+                ('suggested', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profiles.Profile')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='followsuggestion',
+            index=models.Index(fields=['profile', '-score'], name='profiles_fo_profile_60eb59_idx'),
+        ),
+    ]
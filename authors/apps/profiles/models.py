@@ -1,13 +1,41 @@
 import hashlib
 
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete)
 
 from authors.apps.core.models import TimeStampModel
 from authors import settings
 
 
+FOLLOW_COUNTS = ('followers_count', 'following_count')
+
+
+class ProfileQuerySet(models.QuerySet):
+
+    def rebuild_follow_counts(self):
+        """
+        Recompute the number of followers and followed profiles of the
+        profiles. Their modification time is bumped too so that clients
+        polling them see the new counts.
+        """
+        def follows(side):
+            rows = Profile.follows.through.objects.filter(
+                **{side: OuterRef('pk')}).order_by().values(side).annotate(
+                    total=Count('pk')).values('total')
+            return Coalesce(
+                Subquery(rows, output_field=models.IntegerField()), 0)
+
+        return self.update(
+            followers_count=follows('to_profile'),
+            following_count=follows('from_profile'),
+            updated_at=timezone.now())
+
+
 class Profile(TimeStampModel):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     first_name = models.CharField(_('first name'), max_length=30, blank=True, null=True)
@@ -22,15 +50,34 @@ class Profile(TimeStampModel):
     follows = models.ManyToManyField('self', related_name='followed_by', symmetrical=False)
     app_notification_enabled = models.BooleanField(default=True)
     email_notification_enabled = models.BooleanField(default=True)
+    # materialized from the follows, see `count_follows`
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ProfileQuerySet.as_manager()
 
     def __str__(self):
         return self.user.username
 
+    def save(self, *args, **kwargs):
+        """
+        Save the profile without its follow counts, which are only changed
+        by the follow signal receivers below, so that saving a profile
+        loaded before a follow does not undo it.
+        """
+        if self.pk is not None and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in FOLLOW_COUNTS]
+        super().save(*args, **kwargs)
+
     def follow(self, profile):
         self.follows.add(profile)
+        self.refresh_from_db(fields=FOLLOW_COUNTS)
 
     def unfollow(self, profile):
         self.follows.remove(profile)
+        self.refresh_from_db(fields=FOLLOW_COUNTS)
 
     def followers(self, profile):
         return profile.followed_by.all()
@@ -43,6 +90,28 @@ class Profile(TimeStampModel):
         return self.user.username
 
 
+class FollowSuggestion(models.Model):
+    """
+    A profile suggested for a profile to follow, precomputed with its score
+    by `suggestions.rebuild_suggestions` so that suggestions are served
+    with a single indexed read.
+    """
+
+    class Meta:
+        # the suggestions of a profile are read best first
+        indexes = [models.Index(fields=['profile', '-score'])]
+
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name='suggestions')
+    suggested = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    # followed profiles who follow the suggested profile
+    mutual_count = models.PositiveIntegerField(default=0)
+    # tags the profile reads which the suggested profile writes about
+    shared_tag_count = models.PositiveIntegerField(default=0)
+
+
 """
 Generate gravatar url from a user's email
 """
@@ -69,3 +138,95 @@ def create_profile(sender, **kwargs):
 
 # connect the signal to the handler function
 post_save.connect(create_profile, sender=settings.AUTH_USER_MODEL)
+
+
+"""
+Signal receivers keeping the follow counts of the profiles whose follows
+change, moved by the number of follows added or removed, and recounted with
+`rebuild_follow_counts` when all the follows of a profile go at once
+"""
+
+
+def _followed_ids(profile):
+    return list(Profile.follows.through.objects.filter(
+        from_profile=profile).values_list('to_profile_id', flat=True))
+
+
+def _follower_ids(profile):
+    return list(Profile.follows.through.objects.filter(
+        to_profile=profile).values_list('from_profile_id', flat=True))
+
+
+def _move_follow_counts(profile, reverse, pk_set, delta):
+    if not pk_set:
+        return
+    own, theirs = FOLLOW_COUNTS if reverse else reversed(FOLLOW_COUNTS)
+    updates = sorted([
+        ([profile.pk], own, delta * len(pk_set)),
+        (sorted(pk_set), theirs, delta),
+    ])
+    now = timezone.now()
+    # in the order of the ids, so that concurrent follows between two
+    # profiles lock them in the same order
+    for ids, field, change in updates:
+        Profile.objects.filter(pk__in=ids).update(
+            **{field: F(field) + change, 'updated_at': now})
+
+
+def count_follows(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # the follows are gone after the clear so note both sides first
+        instance._cleared_profile_ids = (
+            _followed_ids(instance) + _follower_ids(instance))
+    elif action == 'post_clear':
+        Profile.objects.filter(
+            pk__in=instance._cleared_profile_ids + [instance.pk]
+        ).rebuild_follow_counts()
+    elif action == 'pre_remove':
+        # only the follows which exist are uncounted, locked until they are
+        # deleted so that a concurrent removal does not uncount them again
+        side, other = (
+            ('to_profile', 'from_profile') if reverse
+            else ('from_profile', 'to_profile'))
+        instance._removed_profile_ids = set(
+            sender.objects.select_for_update().filter(**{
+                side: instance.pk, other + '__in': pk_set,
+            }).values_list(other + '_id', flat=True))
+    elif action == 'post_remove':
+        _move_follow_counts(
+            instance, reverse, instance._removed_profile_ids, -1)
+    elif action == 'post_add':
+        # only the follows which did not exist yet are in `pk_set`
+        _move_follow_counts(instance, reverse, pk_set, 1)
+
+
+def note_deleted_profile_follows(sender, instance, **kwargs):
+    # deleting a profile removes its follows without an m2m_changed signal
+    instance._deleted_profile_ids = (
+        _followed_ids(instance) + _follower_ids(instance))
+
+
+def count_deleted_profile_follows(sender, instance, **kwargs):
+    Profile.objects.filter(
+        pk__in=getattr(instance, '_deleted_profile_ids', ())
+    ).rebuild_follow_counts()
+
+
+def drop_followed_suggestions(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    # followed profiles are no longer worth suggesting
+    if action != 'post_add':
+        return
+    if reverse:
+        FollowSuggestion.objects.filter(
+            profile__in=pk_set, suggested=instance).delete()
+    else:
+        FollowSuggestion.objects.filter(
+            profile=instance, suggested__in=pk_set).delete()
+
+
+m2m_changed.connect(count_follows, sender=Profile.follows.through)
+m2m_changed.connect(
+    drop_followed_suggestions, sender=Profile.follows.through)
+pre_delete.connect(note_deleted_profile_follows, sender=Profile)
+post_delete.connect(count_deleted_profile_follows, sender=Profile)
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FollowCursorPagination(CursorPagination):
+    """
+    Keyset pagination for followers and followed profiles, so that the
+    profiles of popular authors are listed a page at a time at the same cost
+    however deep the page is. Pass `?page_size=` for up to 100 profiles a
+    page.
+    """
+    ordering = ('-pk',)
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ProfileCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the directory of profiles, in the order of the
+    unique index on usernames, which the listed profiles must annotate as
+    `username`. Pass `?page_size=` for up to 100 profiles a page.
+    """
+    ordering = ('username',)
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
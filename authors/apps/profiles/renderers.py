@@ -1,26 +1,8 @@
-import json
+from authors.apps.core.renderers import EnvelopeJSONRenderer
 
-from rest_framework.renderers import JSONRenderer
-
-
-class ProfileJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Check for errors key in data
-        """
-        errors = data.get('errors', None)
-
-        if errors:
-            """
-            We will let the default JSONRenderer handle
-            rendering errors.
-            """
-            return super(ProfileJSONRenderer, self).render(data)
-
-        # Finally, we can render our data under the "profile" namespace.
-        return json.dumps({
-            'profile': data
-        })
 
+class ProfileJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render profiles under the "profile" namespace.
+    """
+    envelope = 'profile'
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Profile
+from .models import FollowSuggestion, Profile
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -11,5 +11,14 @@ class ProfileSerializer(serializers.ModelSerializer):
         fields = [
             'username', 'first_name', 'last_name', 'birth_date', 'bio',
             'avatar', 'city', 'country', 'phone', 'website', 'created_at',
-            'updated_at', 'app_notification_enabled'
+            'updated_at', 'app_notification_enabled', 'followers_count',
+            'following_count'
         ]
+
+
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    profile = ProfileSerializer(source='suggested')
+
+    class Meta:
+        model = FollowSuggestion
+        fields = ['profile', 'score', 'mutual_count', 'shared_tag_count']
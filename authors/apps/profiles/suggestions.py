@@ -0,0 +1,163 @@
+"""
+Suggestions of authors to follow.
+
+Suggestions are computed for every profile at once by `rebuild_suggestions`
+and stored in `FollowSuggestion`, so serving them is a read of a profile's
+best rows. The whole follow graph, the tags authors write about and read
+and the engagement of their articles are loaded with a handful of queries,
+then candidates are gathered and scored with set operations in memory:
+
+* friends of friends, scored by the number of followed profiles who follow
+  the candidate,
+* the authors with the most engagement in each of the tags the profile
+  reads most, scored by the number of tags they share,
+* the authors with the most engagement overall, for profiles without
+  follows or reading history.
+
+Every candidate is also scored by the engagement of their articles.
+Profiles already followed, the profile itself and candidates scoring
+nothing are never suggested.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+
+from authors.apps.articles.models import Article, Likes
+from .models import FollowSuggestion, Profile
+
+# weights of the parts of a score, engagement counts in log scale
+MUTUAL_WEIGHT = 3.0
+SHARED_TAG_WEIGHT = 2.0
+ENGAGEMENT_WEIGHT = 1.0
+# how many of the tags a profile reads most are used to find authors
+READ_TAGS = 10
+# how many of the most engaging authors are kept per tag and overall
+TOP_AUTHORS = 20
+# how many profiles get their suggestions replaced per transaction
+WRITE_BATCH_SIZE = 500
+
+
+def _ranked(counts, size):
+    return [key for key, _ in counts.most_common(size)]
+
+
+def load_graph():
+    """
+    Load what suggestions are computed from, keyed by profile id: the
+    followed profiles, the tags written about and read, and the engagement
+    of the articles written.
+    """
+    profiles = dict(Profile.objects.values_list('user_id', 'pk'))
+    authors = dict(Profile.objects.values_list('user__username', 'pk'))
+
+    follows = defaultdict(set)
+    for follower, followed in Profile.follows.through.objects.values_list(
+            'from_profile_id', 'to_profile_id'):
+        follows[follower].add(followed)
+
+    written = defaultdict(set)
+    for author, tag in Article.article_tags.through.objects.values_list(
+            'article__author_id', 'articletags_id'):
+        written[authors[author]].add(tag)
+
+    # articles read are those liked, favourited or written
+    read = defaultdict(Counter)
+    liked = Likes.objects.filter(
+        like=True, article__article_tags__isnull=False).values_list(
+            'user_id', 'article__article_tags')
+    favourited = Article.favourited.through.objects.filter(
+        article__article_tags__isnull=False).values_list(
+            'user_id', 'article__article_tags')
+    for rows in (liked, favourited):
+        for user_id, tag in rows:
+            read[profiles[user_id]][tag] += 1
+    for profile, tags in written.items():
+        read[profile].update(tags)
+
+    engagement = {
+        authors[author]: total
+        for author, total in Article.objects.order_by().values(
+            'author_id').annotate(total=Sum(
+                F('likes_count') + F('favourites_count'))).values_list(
+                    'author_id', 'total')}
+    return profiles.values(), follows, written, read, engagement
+
+
+def suggest(profile, follows, written, read, engaging, tag_authors,
+            popular):
+    """
+    Score the candidates for a profile and return the best
+    `FOLLOW_SUGGESTIONS_SIZE` as unsaved suggestions.
+    :params dict engaging: the engagement part of the score of authors
+    """
+    followed = follows.get(profile, set())
+    mutual = Counter()
+    for friend in followed:
+        mutual.update(follows.get(friend, ()))
+
+    read_tags = set(_ranked(read.get(profile, Counter()), READ_TAGS))
+    candidates = set(mutual) | set(popular)
+    for tag in read_tags:
+        candidates.update(tag_authors.get(tag, ()))
+    candidates -= followed
+    candidates.discard(profile)
+
+    scored = []
+    for candidate in candidates:
+        tags = written.get(candidate)
+        shared = len(read_tags & tags) if tags and read_tags else 0
+        score = (
+            MUTUAL_WEIGHT * mutual[candidate] +
+            SHARED_TAG_WEIGHT * shared + engaging.get(candidate, 0))
+        if score:
+            scored.append((score, -candidate, shared))
+    return [
+        FollowSuggestion(
+            profile_id=profile, suggested_id=-candidate, score=score,
+            mutual_count=mutual[-candidate], shared_tag_count=shared)
+        for score, candidate, shared in heapq.nlargest(
+            settings.FOLLOW_SUGGESTIONS_SIZE, scored)]
+
+
+def rebuild_suggestions():
+    """
+    Recompute the suggestions of every profile, replacing them a batch of
+    profiles at a time. Return the number of suggestions stored.
+    """
+    profiles, follows, written, read, engagement = load_graph()
+
+    def most_engaging(authors):
+        return _ranked(Counter(
+            {author: engagement.get(author, 0) for author in authors}),
+            TOP_AUTHORS)
+
+    by_tag = defaultdict(set)
+    for author, tags in written.items():
+        for tag in tags:
+            by_tag[tag].add(author)
+    tag_authors = {
+        tag: most_engaging(authors) for tag, authors in by_tag.items()}
+    popular = most_engaging(engagement)
+    engaging = {
+        author: ENGAGEMENT_WEIGHT * math.log1p(total)
+        for author, total in engagement.items()}
+
+    stored = 0
+    profiles = iter(sorted(profiles))
+    while True:
+        batch = list(islice(profiles, WRITE_BATCH_SIZE))
+        if not batch:
+            return stored
+        suggestions = [
+            suggestion for profile in batch
+            for suggestion in suggest(profile, follows, written, read,
+                                      engaging, tag_authors, popular)]
+        with transaction.atomic():
+            FollowSuggestion.objects.filter(profile__in=batch).delete()
+            FollowSuggestion.objects.bulk_create(suggestions)
+        stored += len(suggestions)
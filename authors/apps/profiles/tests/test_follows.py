@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import Profile
+
+
+class FollowTests(APITestCase):
+    """Test suite for the follower graph of profiles."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                'user{}'.format(index), 'user{}@company.com'.format(index),
+                'user{}pass'.format(index))
+            for index in range(5)]
+        self.profiles = [user.profile for user in self.users]
+        self.client.force_authenticate(self.users[0])
+
+    def counts(self, profile):
+        profile.refresh_from_db()
+        return profile.followers_count, profile.following_count
+
+    def test_follow_counts_follow_the_follows(self):
+        """
+        Tests that the counts of both sides change as profiles are followed,
+        unfollowed and deleted, and that saving a stale profile keeps them.
+        """
+        first, second, third = self.profiles[:3]
+        stale = Profile.objects.get(pk=first.pk)
+        first.follow(second)
+        first.follow(third)
+        third.follow(second)
+        self.assertEqual(first.following_count, 2)
+        self.assertEqual(self.counts(second), (2, 0))
+        stale.bio = 'Stale'
+        stale.save()
+        self.assertEqual(self.counts(first), (0, 2))
+
+        first.unfollow(second)
+        self.assertEqual(self.counts(second), (1, 0))
+        second.followed_by.clear()
+        self.assertEqual(self.counts(second), (0, 0))
+        self.assertEqual(self.counts(third), (1, 0))
+        self.users[1].delete()
+        self.assertEqual(self.counts(first), (0, 1))
+
+    def test_follows_move_the_counts_once(self):
+        """
+        Tests that follows added or removed again, or from the followed
+        side, move the counts once without recounting the follows.
+        """
+        first, second, third = self.profiles[:3]
+        with CaptureQueriesContext(connection) as queries:
+            first.follow(second)
+        self.assertNotIn('COUNT', ' '.join(q['sql'] for q in queries))
+        first.follow(second)
+        first.unfollow(third)
+        self.assertEqual(self.counts(first), (0, 1))
+        self.assertEqual(self.counts(third), (0, 0))
+        second.followed_by.add(third)
+        self.assertEqual(self.counts(second), (2, 0))
+        self.assertEqual(self.counts(third), (0, 1))
+        second.followed_by.remove(first, third)
+        self.assertEqual(self.counts(second), (0, 0))
+        self.assertEqual(self.counts(first), (0, 0))
+
+    def test_follow_lists_are_paginated(self):
+        """
+        Tests that followers are listed a page at a time with a fixed
+        number of queries.
+        """
+        followed = self.profiles[0]
+        for profile in self.profiles[1:]:
+            profile.follow(followed)
+        url = reverse('profiles:followers', kwargs={'username': 'user0'})
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(
+            [profile['username'] for profile in response.data['results']],
+            ['user4', 'user3'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [profile['username'] for profile in response.data['results']],
+            ['user2', 'user1'])
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url, {'page_size': 4})
+        self.assertEqual(len(few), len(many))
+
+        response = self.client.get(
+            reverse('profiles:following', kwargs={'username': 'user1'}))
+        self.assertEqual(response.data['results'][0]['username'], 'user0')
+        response = self.client.get(
+            reverse('profiles:followers', kwargs={'username': 'nobody'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_is_following_in_one_query(self):
+        """
+        Tests that whether the current user follows a list of users is
+        answered with a single query.
+        """
+        self.profiles[0].follow(self.profiles[1])
+        self.profiles[0].follow(self.profiles[3])
+        url = reverse('profiles:is_following')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, {'usernames': 'user1,user2,user3,nobody'})
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data, {
+            'user1': True, 'user2': False, 'user3': True, 'nobody': False})
+        response = self.client.get(url, {'usernames': ','.join(
+            'user{}'.format(index) for index in range(101))})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
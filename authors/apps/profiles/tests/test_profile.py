@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -79,7 +81,7 @@ class ProfileTests(APITestCase):
         login_response = self.client.post(self.login_url, self.user_data, format='json')
         headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
         follow_response = self.client.post(self.follow_url, **headers)
-        self.assertEqual(len(follow_response.data), 13)
+        self.assertEqual(len(follow_response.data), 15)
         self.assertEqual(follow_response.status_code, status.HTTP_200_OK)
 
         follow_self_response = self.client.post(
@@ -98,7 +100,7 @@ class ProfileTests(APITestCase):
         headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
 
         unfollow_response = self.client.delete(self.follow_url, **headers)
-        self.assertEqual(len(unfollow_response.data), 13)
+        self.assertEqual(len(unfollow_response.data), 15)
         self.assertEqual(unfollow_response.status_code, status.HTTP_200_OK)
 
         unfollow_self_response = self.client.delete(reverse('profiles:follow',
@@ -116,7 +118,7 @@ class ProfileTests(APITestCase):
         headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
         self.client.post(self.follow_url, **headers)
         following_response = self.client.get(self.following_url, **headers)
-        self.assertEqual(len(following_response.data), 1)
+        self.assertEqual(len(following_response.data['results']), 1)
         self.assertEqual(following_response.status_code, status.HTTP_200_OK)
 
     def test_follower(self):
@@ -128,7 +130,7 @@ class ProfileTests(APITestCase):
         headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
         self.client.post(self.follow_url, **headers)
         follower_response = self.client.get(self.followers_url, **headers)
-        self.assertEqual(len(follower_response.data), 1)
+        self.assertEqual(len(follower_response.data['results']), 1)
 
     def test_list_authors_profile(self):
         """
@@ -139,3 +141,62 @@ class ProfileTests(APITestCase):
         headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
         response = self.client.get(self.profiles_url, **headers)
         self.assertEqual(len(response.data['results']), 1)
+
+    def test_authors_profiles_are_paged_by_username(self):
+        """
+        Ensure profiles are listed a page at a time in username order with
+        a fixed number of queries, and searched by username prefix
+        :return: a page of profiles
+        """
+        for username in ('bob', 'alice', 'Alan', 'carol'):
+            User.objects.create_user(username, username + '@company.com', 'pass1234')
+        login_response = self.client.post(self.login_url, self.user_data, format='json')
+        headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
+        self.client.get(self.profiles_url, **headers)
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.get(self.profiles_url, {'page_size': 2}, **headers)
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['Alan', 'alice'])
+        response = self.client.get(response.data['next'], **headers)
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['bob', 'carol'])
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.profiles_url, {'page_size': 5}, **headers)
+        self.assertEqual(len(few), len(many))
+
+        response = self.client.get(self.profiles_url, {'search': 'al'}, **headers)
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['Alan', 'alice'])
+
+    def test_unchanged_authors_profiles_are_not_sent_again(self):
+        """
+        Ensure polling unchanged profiles with their ETag returns an empty
+        304 response, until a profile is added after the last page
+        """
+        login_response = self.client.post(self.login_url, self.user_data, format='json')
+        headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
+        # a page holding every profile, so the last one
+        page = {'page_size': len(self.client.get(self.profiles_url, **headers).data['results'])}
+        response = self.client.get(self.profiles_url, page, **headers)
+        response = self.client.get(
+            self.profiles_url, page, HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        User.objects.create_user('zzz', 'zzz@company.com', 'pass1234')
+        response = self.client.get(
+            self.profiles_url, page, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_renamed_authors_profiles_are_sent_again(self):
+        """
+        Ensure renaming a user changes the ETag of the profiles listing them
+        """
+        User.objects.create_user('bob', 'bob@company.com', 'pass1234')
+        login_response = self.client.post(self.login_url, self.user_data, format='json')
+        headers = {'HTTP_AUTHORIZATION': 'Bearer {}'.format(login_response.data.get('token'))}
+        etag = self.client.get(self.profiles_url, **headers)['ETag']
+        User.objects.filter(username='bob').update(username='robert')
+        response = self.client.get(
+            self.profiles_url, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('robert', [profile['username'] for profile in response.data['results']])
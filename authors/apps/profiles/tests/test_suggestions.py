@@ -0,0 +1,95 @@
+import math
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from authors.apps.articles.models import Article, Likes
+from authors.apps.articles.views import create_tag
+from authors.apps.authentication.models import User
+from authors.apps.core.cron import FollowSuggestionsCron
+from authors.apps.profiles.models import FollowSuggestion
+
+
+class FollowSuggestionTests(APITestCase):
+    """Test suite for the suggestions of authors to follow."""
+
+    def setUp(self):
+        self.users = {
+            username: User.objects.create_user(
+                username, username + '@company.com', username + 'pass')
+            for username in ('reader', 'friend', 'mutual', 'popular', 'liked')}
+        self.profiles = {
+            username: user.profile for username, user in self.users.items()}
+        self.url = reverse('profiles:suggestions')
+
+    def publish(self, author, tags, likes=0):
+        article = Article.objects.create(
+            title='Title', body='body', description='description',
+            author=self.users[author])
+        create_tag(tags, article)
+        Article.objects.filter(pk=article.pk).update(likes_count=likes)
+        return article
+
+    def suggestions(self):
+        self.client.force_authenticate(self.users['reader'])
+        response = self.client.get(self.url)
+        return [(suggestion['profile']['username'],
+                 suggestion['mutual_count'], suggestion['shared_tag_count'])
+                for suggestion in response.data]
+
+    def test_suggestions_are_ranked_from_follows_tags_and_engagement(self):
+        """
+        Tests that friends of friends and authors of the tags a user reads
+        are suggested, best first, and never the followed authors.
+        """
+        self.profiles['reader'].follow(self.profiles['friend'])
+        self.profiles['friend'].follow(self.profiles['mutual'])
+        self.publish('popular', 'python', likes=10)
+        liked = self.publish('liked', 'python', likes=1)
+        Likes.objects.create(
+            article=liked, user=self.users['reader'], like=True)
+        FollowSuggestionsCron().do()
+
+        self.assertEqual(self.suggestions(), [
+            ('popular', 0, 1), ('mutual', 1, 0), ('liked', 0, 1)])
+        self.profiles['reader'].follow(self.profiles['popular'])
+        self.assertEqual(
+            [username for username, _, _ in self.suggestions()],
+            ['mutual', 'liked'])
+
+    def test_engagement_adds_up_over_articles(self):
+        """
+        Tests that an author is scored by the engagement of all their
+        articles rather than of one of them.
+        """
+        self.publish('popular', 'python', likes=3)
+        self.publish('popular', 'django', likes=4)
+        self.publish('liked', 'flask', likes=5)
+        FollowSuggestionsCron().do()
+        scores = dict(FollowSuggestion.objects.filter(
+            profile=self.profiles['reader']).values_list(
+                'suggested__user__username', 'score'))
+        self.assertAlmostEqual(scores['popular'], math.log1p(7))
+        self.assertAlmostEqual(scores['liked'], math.log1p(5))
+
+    def test_suggestions_are_served_in_one_query(self):
+        """
+        Tests that suggestions are read with a single query, however many
+        there are, and replaced when they are recomputed.
+        """
+        self.publish('popular', 'python', likes=10)
+        self.client.force_authenticate(self.users['reader'])
+        FollowSuggestionsCron().do()
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        self.publish('liked', 'django', likes=1)
+        FollowSuggestionsCron().do()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(len(many), 1)
+        self.assertEqual(FollowSuggestion.objects.filter(
+            profile=self.profiles['reader']).count(), 2)
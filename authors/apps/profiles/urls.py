@@ -1,11 +1,16 @@
 from django.urls import path
-from .views import FollowAPIView, FollowersAPIView, FollowingAPIView, ProfilesAPIView
+from .views import (
+    FollowAPIView, FollowersAPIView, FollowingAPIView,
+    FollowSuggestionsAPIView, IsFollowingAPIView, ProfilesAPIView)
 
 
 app_name = 'profiles'
 
 urlpatterns = [
     path('authors/', ProfilesAPIView.as_view(), name='profiles'),
+    path('suggestions/', FollowSuggestionsAPIView.as_view(),
+         name='suggestions'),
+    path('is-following/', IsFollowingAPIView.as_view(), name='is_following'),
     path('<username>/follow/', FollowAPIView.as_view(), name='follow'),
     path('<username>/followers/', FollowersAPIView.as_view(), name='followers'),
     path('<username>/following/', FollowingAPIView.as_view(), name='following')
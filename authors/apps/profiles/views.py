@@ -4,12 +4,14 @@ from rest_framework.exceptions import NotFound
 from rest_framework.serializers import ValidationError
 from rest_framework import status, generics
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
+from django.db.models import F
 
-from .models import Profile
+from .models import FollowSuggestion, Profile
+from .pagination import FollowCursorPagination, ProfileCursorPagination
 from .renderers import ProfileJSONRenderer
-from .serializers import ProfileSerializer
+from .serializers import FollowSuggestionSerializer, ProfileSerializer
 from authors.apps.authentication.serializers import UserSerializer
+from authors.apps.core.conditional import conditional_get, make_etag
 
 
 class FollowAPIView(APIView):
@@ -71,62 +73,131 @@ class FollowAPIView(APIView):
         return Response(data=serialize.data, status=status.HTTP_200_OK)
 
 
-class FollowersAPIView(generics.RetrieveAPIView):
-    """ This class contains a method to get all followers
-    Get:
-    Followers
-
+class FollowListAPIView(generics.ListAPIView):
+    """
+    Base class for the lists of profiles on one side of the follows of the
+    profile named in the URL, a page at a time.
     """
     permission_classes = (IsAuthenticated,)
     serializer_class = ProfileSerializer
+    pagination_class = FollowCursorPagination
+    # the lookup from the listed profiles to the profile in the URL
+    follow_lookup = None
 
-    def get(self, request, username):
-        """Followers"""
+    def get_queryset(self):
+        try:
+            profile = Profile.objects.get(
+                user__username=self.kwargs['username'])
+        except Profile.DoesNotExist:
+            raise NotFound('The user you are looking for does not exist')
+        return Profile.objects.filter(
+            **{self.follow_lookup: profile}).select_related('user')
 
-        user = request.user.profile
-        profile = Profile.objects.get(user__username=username)
 
-        follower = user.followers(profile)
+class FollowersAPIView(FollowListAPIView):
+    """ This class contains a method to get all followers
+    Get:
+    Followers
 
-        serializer = self.serializer_class(follower, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    """
+    follow_lookup = 'follows'
 
 
-class FollowingAPIView(APIView):
+class FollowingAPIView(FollowListAPIView):
     """ This class contains a method to get all following users
     Get:
     Following
      """
+    follow_lookup = 'followed_by'
 
-    permission_classes = (IsAuthenticated,)
-
-    serializer_class = ProfileSerializer
-
-    def get(self, request, username):
-        """Following"""
 
-        user = request.user.profile
-        profile = Profile.objects.get(user__username=username)
+class IsFollowingAPIView(APIView):
+    """ This class contains a method to check which of a list of users the
+    current user follows
+    Get:
+    Is following, for the comma separated `?usernames=`
+    """
+    permission_classes = (IsAuthenticated,)
+    max_usernames = 100
+
+    def get(self, request):
+        usernames = [
+            username.strip() for username in request.query_params.get(
+                'usernames', '').split(',') if username.strip()]
+        if len(usernames) > self.max_usernames:
+            raise ValidationError('You can check at most {} users'.format(
+                self.max_usernames))
+        followed = set(Profile.follows.through.objects.filter(
+            from_profile=request.user.profile,
+            to_profile__user__username__in=usernames).values_list(
+                'to_profile__user__username', flat=True))
+        return Response({username: username in followed
+                         for username in usernames}, status=status.HTTP_200_OK)
+
+
+class FollowSuggestionsAPIView(generics.ListAPIView):
+    """ This class contains a method to get the authors suggested for the
+    current user to follow, best first, as last computed by
+    `FollowSuggestionsCron`
+    Get:
+    Suggestions
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = FollowSuggestionSerializer
+    pagination_class = None
 
-        following = user.following(profile)
-        serializer = self.serializer_class(following, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        return FollowSuggestion.objects.filter(
+            profile__user=self.request.user).order_by(
+                '-score').select_related('suggested__user')
 
 
 class ProfilesAPIView(generics.ListAPIView):
-    """This class allows authenticated users to get all profiles
+    """This class allows authenticated users to get all profiles, by
+    username, optionally only those whose username starts with `?search=`
     Get:
     Profiles
     """
     permission_classes = (IsAuthenticated,)
 
-    queryset = Profile.objects.all().exclude()
     serializer_class = ProfileSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = ProfileCursorPagination
+
+    def get_queryset(self):
+        """
+        Load the users with the profiles, ordered and searched by the
+        indexed username.
+        """
+        queryset = Profile.objects.exclude(user=self.request.user).annotate(
+            username=F('user__username')).select_related('user')
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            queryset = queryset.filter(user__username__istartswith=search)
+        return queryset
+
+    def get_validators(self, request):
+        """
+        Derive the ETag from the profiles of the page and the links to the
+        pages around it, which change when a profile is added next to the
+        page. The page is read once here and serialized by `list` when it
+        changed. Usernames are kept on the user, so renaming one does not
+        move `updated_at` and they are part of the ETag instead. There is no
+        modification time, as a profile leaving the page can make the page
+        older.
+        """
+        self.page = self.paginate_queryset(self.get_queryset())
+        etag = make_etag(
+            request.user.pk, request.get_full_path(),
+            self.paginator.get_next_link(),
+            self.paginator.get_previous_link(), *[
+                (profile.pk, profile.username, profile.updated_at)
+                for profile in self.page])
+        return etag, None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset().exclude(user=request.user)
-        page = self.paginate_queryset(queryset)
-        serializer = ProfileSerializer(queryset, page, many=True)
-        serializer.is_valid()
+        serializer = self.get_serializer(self.page, many=True)
         return self.get_paginated_response(serializer.data)
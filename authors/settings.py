@@ -60,6 +60,9 @@ INSTALLED_APPS = [
 
 CRON_CLASSES = [
     "authors.apps.core.cron.EmailNotificationCron",
+    "authors.apps.core.cron.TagCountsCron",
+    "authors.apps.core.cron.FollowSuggestionsCron",
+    "authors.apps.core.cron.TrendingArticlesCron",
 ]
 
 MIDDLEWARE = [
@@ -107,6 +110,14 @@ DATABASES = {
     'default': env.db()
 }
 
+# Cache
+# e.g. locmemcache://, filecache:///var/tmp/authors or redis://127.0.0.1:6379/1
+# (the last needs django-redis installed)
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://')
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
@@ -259,3 +270,51 @@ WORDS_PER_MIN = env('WORDS_PER_MIN')
 
 # CRONJOB TIME
 RUN_EVERY_MINS = env('RUN_EVERY_MINS')
+
+# MINUTES BETWEEN REBUILDS OF THE TAG COUNTS
+TAG_COUNTS_EVERY_MINS = env.int('TAG_COUNTS_EVERY_MINS', default=60)
+
+# MINUTES BETWEEN REBUILDS OF THE SUGGESTIONS OF AUTHORS TO FOLLOW, AND THE
+# NUMBER OF SUGGESTIONS KEPT PER USER
+FOLLOW_SUGGESTIONS_EVERY_MINS = env.int(
+    'FOLLOW_SUGGESTIONS_EVERY_MINS', default=6 * 60)
+FOLLOW_SUGGESTIONS_SIZE = env.int('FOLLOW_SUGGESTIONS_SIZE', default=20)
+
+# MINUTES BETWEEN UPDATES OF THE TRENDING ARTICLES, HOURS IN WHICH THE WEIGHT
+# OF ENGAGEMENT HALVES, AND THE NUMBER OF TRENDING ARTICLES LISTED
+TRENDING_EVERY_MINS = env.int('TRENDING_EVERY_MINS', default=15)
+TRENDING_HALF_LIFE_HOURS = env.int('TRENDING_HALF_LIFE_HOURS', default=24)
+TRENDING_SIZE = env.int('TRENDING_SIZE', default=100)
+
+# NUMBER OF NOTIFICATIONS EMAILED PER BATCH
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', default=100)
+
+# NUMBER OF FOLLOWERS NOTIFIED PER INSERT
+NOTIFICATION_BATCH_SIZE = env.int('NOTIFICATION_BATCH_SIZE', default=1000)
+
+# BACKGROUND TASKS
+# Run tasks in process instead of queueing them, always on in the tests, see
+# `TEST_RUNNER`
+TASKS_EAGER = env.bool('TASKS_EAGER', default=False)
+# Seconds before a failed task is retried, doubled after every attempt
+TASKS_RETRY_DELAY = env.int('TASKS_RETRY_DELAY', default=30)
+# Seconds a worker has to run a task before it is given to another worker
+TASKS_LEASE_SECONDS = env.int('TASKS_LEASE_SECONDS', default=10 * 60)
+TEST_RUNNER = 'authors.apps.core.runner.TestRunner'
+
+# SECONDS A SERIALIZED ARTICLE IS CACHED FOR, UNDER THE `changed_at` OF THE
+# ARTICLE SO THAT A PER PROCESS CACHE IS NEVER READ STALE
+ARTICLE_CACHE_TIMEOUT = env.int('ARTICLE_CACHE_TIMEOUT', default=60 * 60)
+
+# TOKENS WHOSE USERS ARE CACHED PER PROCESS, AND FOR HOW MANY SECONDS
+AUTH_CACHE_SIZE = env.int('AUTH_CACHE_SIZE', default=1024)
+AUTH_CACHE_TTL = env.int('AUTH_CACHE_TTL', default=60)
+
+# NUMBER OF ARTICLES LOADED AT A TIME WHEN EXPORTING
+ARTICLE_EXPORT_CHUNK_SIZE = env.int('ARTICLE_EXPORT_CHUNK_SIZE', default=500)
+
+# FOLLOWERS ABOVE WHICH AN AUTHOR'S ARTICLES ARE NOT PUSHED TO FEEDS
+FEED_FANOUT_THRESHOLD = env.int('FEED_FANOUT_THRESHOLD', default=5000)
+
+# NUMBER OF FEEDS AN ARTICLE IS PUSHED TO PER JOB
+FEED_FANOUT_CHUNK_SIZE = env.int('FEED_FANOUT_CHUNK_SIZE', default=1000)
@@ -18,6 +18,8 @@ from django.contrib import admin
 
 from rest_framework_swagger.views import get_swagger_view
 
+from authors.apps.articles.views import TagListAPIView
+
 # Create schema view.
 # Responsible for generating and rendering the JSON spec and rendering the UI
 schema_view = get_swagger_view(title="Authors Haven API Documentation")
@@ -30,6 +32,7 @@ urlpatterns = [
             'authors.apps.authentication.urls', namespace='authentication')),
     path('api/articles/',
          include('authors.apps.articles.urls', namespace='articles')),
+    path('api/tags/', TagListAPIView.as_view(), name='tags'),
     path('', schema_view),
     path('api/profiles/',
          include('authors.apps.profiles.urls', namespace='profiles')),